@@ -2,6 +2,7 @@ import logging
 import pathlib
 import subprocess
 import time
+import typing
 
 import click
 
@@ -33,12 +34,34 @@ cli = AliasedGroup(
 @click.option("--debug/--no-debug", "-D/-ND", default=False, help="Debug mode, show detail information.")
 @click.option("--offline", "-O", is_flag=True, help="Offline mode, skip network requests.")
 @click.option("-f", "--file", default="", help="Input source file.")
+@click.option(
+    "-e",
+    "--engine",
+    default=None,
+    type=click.Choice(["ast", "scan"]),
+    help="Import scanner engine, [scan] falls back to [ast] on ambiguous sources, [parser.engine] by default.",
+)
+@click.option("-E", "--entry", multiple=True, help="Entry file to pack, can be used multiple times.")
+@click.option("-H", "--hidden-import", multiple=True, help="Module imported dynamically, can be used multiple times.")
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=0),
+    help="Parallel jobs for parsing and packing, 0 for all cores.",
+)
+@click.option("-w", "--watch", is_flag=True, help="Watch mode, update dist when source files change.")
 @click.argument("directory", default=None, required=False)
 def build_command(
     archive: bool,
     directory: str,
+    engine: typing.Optional[str],
+    entry: typing.Tuple[str, ...],
     file: str,
+    hidden_import: typing.Tuple[str, ...],
+    jobs: int,
     offline: bool,
+    watch: bool,
     debug: bool,
 ):
     """Build source files."""
@@ -61,6 +84,12 @@ def build_command(
 
     settings.config["mode.archive"] = archive
     settings.config["mode.offline"] = offline
+    if engine is not None:
+        settings.overrides["parser.engine"] = engine
+    if entry:
+        settings.overrides["parser.entries"] = list(entry)
+    if hidden_import:
+        settings.overrides["parser.hidden_imports"] = list(hidden_import)
 
     file_path = pathlib.Path(file)
     dir_path = pathlib.Path(directory) if directory is not None else pathlib.Path.cwd()
@@ -74,11 +103,14 @@ def build_command(
 
     from fspacker.process import Processor
 
-    processor = Processor(dir_path, file_path)
+    processor = Processor(dir_path, file_path, jobs=jobs)
     processor.run()
 
     logging.info(f"Packing done! Total used: [{time.perf_counter() - t0:.2f}]s.")
 
+    if watch:
+        processor.watch()
+
 
 @cli.command("update", short_help="Update version for fspacker based on the latest Git tag. [u]")
 def update_command():
@@ -106,6 +138,48 @@ def update_command():
     print(f"Updated version to {new_version}")
 
 
+@cli.group("cache", cls=AliasedGroup, short_help="Manage libs repo and embed repo caches. [c]")
+def cache_group():
+    """Manage libs repo and embed repo caches."""
+
+
+@cache_group.command("stats", short_help="Show cache sizes and hit rate. [s]")
+def cache_stats_command():
+    """Show cache sizes and hit rate."""
+
+    from fspacker.core.cachemanager import cache_manager
+
+    stats = cache_manager.stats()
+    for repo, usage in stats["repos"].items():
+        click.echo(f"{repo}: {usage['files']} files, {usage['bytes'] / 1024**2:.2f}MB")
+    click.echo(f"total: {stats['total'] / 1024**2:.2f}MB / {stats['max_size'] / 1024**2:.2f}MB")
+    click.echo(f"hit rate: {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)")
+
+
+@cache_group.command("prune", short_help="Evict least recently used archives over size cap. [p]")
+@click.option("-s", "--max-size", default=None, type=click.IntRange(min=0), help="Size cap in MB, [cache.max_size].")
+@click.option(
+    "-l",
+    "--lockfile",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+    help="Archives pinned, one name or glob per line, [cache.lock] in cache dir by default.",
+)
+@click.option("-n", "--dry-run", is_flag=True, help="Only show archives to evict.")
+def cache_prune_command(max_size: typing.Optional[int], lockfile: typing.Optional[pathlib.Path], dry_run: bool):
+    """Evict least recently used archives over size cap."""
+
+    logging.basicConfig(level=logging.INFO, format="[*] %(message)s")
+
+    from fspacker.core.cachemanager import cache_manager
+
+    max_bytes = max_size * 1024**2 if max_size is not None else None
+    evicted, reclaimed = cache_manager.prune(max_bytes, lockfile=lockfile, dry_run=dry_run)
+    action = "to evict" if dry_run else "evicted"
+    click.echo(f"{evicted} archives {action}, {reclaimed / 1024**2:.2f}MB reclaimed")
+    click.echo(f"hit rate: {cache_manager.hit_rate:.1%}")
+
+
 @cli.command("version", short_help="Show version information. [v]")
 def version_command():
     """Show version information."""
@@ -4,19 +4,27 @@ import importlib.metadata
 import json
 import logging
 import os
-import tarfile
+import pathlib
+import threading
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 
 import packaging.requirements
+import packaging.utils
 import stdlib_list
 from pkginfo import Wheel
 
+from fspacker.core.markers import markers
 from fspacker.settings import settings
+from fspacker.utils.zip import read_sdist_metadata
 
 __all__ = [
+    "DependencyGraph",
     "LibraryAnalyzer",
     "LibraryMetaData",
     "BuiltInLibraryAnalyzer",
@@ -66,9 +74,28 @@ class LibraryMetaData:
     dependencies: List[str] = dataclasses.field(default_factory=list)
 
 
+@dataclasses.dataclass
+class DependencyGraph:
+    """Transitive dependencies of installed distributions.
+
+    Attributes:
+        adjacency (Dict[str, List[str]]): Direct dependencies of each distribution, by normalized name.
+        order (List[str]): Distributions in topological order, dependencies before dependents.
+    """
+
+    adjacency: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
+    order: List[str] = dataclasses.field(default_factory=list)
+
+
 class LibraryAnalyzer:
     """A class for in-depth analysis of specific Python library information."""
 
+    # active requirements of distributions by normalized name, None if not installed, shared by all analyzers
+    REQUIRES: Dict[str, Optional[List[str]]] = {}
+    MAX_WORKERS = 8
+
+    _lock = threading.Lock()
+
     def __init__(self, library_name: str):
         """
         Initialize the LibraryAnalyzer class with the library name.
@@ -78,7 +105,10 @@ class LibraryAnalyzer:
         """
         self.library_name: str = library_name
         self.metadata: LibraryMetaData = self.get_library_metadata()
-        self.dependency_tree = self.build_dependency_tree()
+
+    @cached_property
+    def dependency_tree(self) -> Dict[str, List[str]]:
+        return self.build_dependency_tree()
 
     def get_library_metadata(self) -> LibraryMetaData:
         """
@@ -91,6 +121,7 @@ class LibraryAnalyzer:
             dist = importlib.metadata.distribution(self.library_name)
             raw_dependencies = dist.requires or []
             dependencies: List[str] = self._parse_dependencies(raw_dependencies)
+            self._remember(self.library_name, self._active_dependencies(raw_dependencies))
 
             return LibraryMetaData(
                 name=dist.metadata["Name"],
@@ -104,6 +135,7 @@ class LibraryAnalyzer:
 
         except importlib.metadata.PackageNotFoundError:
             logging.error(f"Library '{self.library_name}' not found.")
+            self._remember(self.library_name, None)
             return LibraryMetaData()
         except Exception as e:
             logging.error(f"Error retrieving metadata for '{self.library_name}': {e}")
@@ -112,7 +144,7 @@ class LibraryAnalyzer:
     @staticmethod
     def _parse_dependencies(raw_dependencies: List[str]) -> List[str]:
         """
-        Parse dependencies to extract only the library names.
+        Parse dependencies to extract only the library names, active on target runtime.
 
         Args:
             raw_dependencies (List[str]): The original list of dependencies.
@@ -120,47 +152,108 @@ class LibraryAnalyzer:
         Returns:
             List[str]: A list of parsed dependency library names.
         """
-        parsed_dependencies = []
-        for dep in raw_dependencies:
-            try:
-                requirement = packaging.requirements.Requirement(dep)
-                parsed_dependencies.append(requirement.name)
-            except Exception as e:
-                logging.warning(f"Error parsing dependency '{dep}': {e}")
-        return parsed_dependencies
+        active, _ = markers.split(raw_dependencies)
+        return [requirement.name for requirement in active]
+
+    @staticmethod
+    def _active_dependencies(raw_dependencies: List[str]) -> List[str]:
+        """Normalized names of requirements active on target runtime, extras excluded."""
+
+        active, _ = markers.split(raw_dependencies)
+        return list(dict.fromkeys(packaging.utils.canonicalize_name(_.name) for _ in active))
 
-    def build_dependency_tree(self, depth: int = 1) -> Dict[str, List[str]]:
+    @classmethod
+    def _remember(cls, library_name: str, requires: Optional[List[str]]) -> None:
+        with cls._lock:
+            cls.REQUIRES.setdefault(packaging.utils.canonicalize_name(library_name), requires)
+
+    @classmethod
+    def _read_requires(cls, library_name: str) -> Optional[List[str]]:
+        """Active requirements of an installed distribution, read once per process."""
+
+        name = packaging.utils.canonicalize_name(library_name)
+        with cls._lock:
+            if name in cls.REQUIRES:
+                return cls.REQUIRES[name]
+
+        requires: Optional[List[str]] = None
+        try:
+            dist = importlib.metadata.distribution(library_name)
+            requires = cls._active_dependencies(dist.requires or [])
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        except Exception as e:
+            logging.error(f"Error retrieving metadata for dependency '{library_name}': {e}")
+
+        cls._remember(name, requires)
+        return requires
+
+    @classmethod
+    def resolve_graph(cls, library_names: Iterable[str], depth: Optional[int] = None) -> DependencyGraph:
         """
-        Build a dependency tree, recursively fetching secondary dependencies.
+        Resolve the dependency graph of installed distributions, level by level.
+
+        Metadata of each level is read in parallel, each distribution only once
+        across all analyzers.
 
         Args:
-            depth (int, optional): The recursion depth. Defaults to 1.
+            library_names (Iterable[str]): Root distributions.
+            depth (Optional[int], optional): Levels of dependencies to follow, None for transitive closure.
 
         Returns:
-            Dict[str, List[str]]: The dependency tree.
+            DependencyGraph: Adjacency lists and topological order.
         """
-        if not self.metadata or not hasattr(self.metadata, "dependencies"):
-            return {}
+        adjacency: Dict[str, List[str]] = {}
+        frontier = list(dict.fromkeys(packaging.utils.canonicalize_name(_) for _ in library_names))
+        level = 0
+        with ThreadPoolExecutor(max_workers=cls.MAX_WORKERS) as executor:
+            while frontier:
+                for name, requires in zip(frontier, executor.map(cls._read_requires, frontier)):
+                    if requires is None and level:
+                        logging.warning(f"Dependency library '{name}' not found.")
+                    adjacency[name] = requires or []
+
+                level += 1
+                if depth is not None and level > depth:
+                    break
+                frontier = list(dict.fromkeys(_ for name in frontier for _ in adjacency[name] if _ not in adjacency))
+
+        return DependencyGraph(adjacency=adjacency, order=cls._topological_order(adjacency))
 
-        dependency_tree = {self.library_name: self.metadata.dependencies}
-
-        if depth < 1:
-            return dependency_tree
+    @staticmethod
+    def _topological_order(adjacency: Dict[str, List[str]]) -> List[str]:
+        """Post order of depth first search, edges closing a cycle are ignored."""
+
+        order: List[str] = []
+        visited: typing.Set[str] = set()
+        for root in adjacency:
+            if root in visited:
+                continue
+
+            visited.add(root)
+            stack = [(root, iter(adjacency[root]))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    order.append(node)
+                elif child in adjacency and child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(adjacency[child])))
+        return order
+
+    def build_dependency_tree(self, depth: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Build a dependency tree, recursively fetching secondary dependencies.
 
-        for dep in self.metadata.dependencies:
-            try:
-                dep_dist = importlib.metadata.distribution(dep)
-                dep_raw_dependencies = dep_dist.requires or []
-                dep_dependencies = self._parse_dependencies(dep_raw_dependencies)
-                dependency_tree[dep] = dep_dependencies
-            except importlib.metadata.PackageNotFoundError:
-                logging.warning(f"Dependency library '{dep}' not found.")
-                dependency_tree[dep] = []
-            except Exception as e:
-                logging.error(f"Error retrieving metadata for dependency '{dep}': {e}")
-                dependency_tree[dep] = []
+        Args:
+            depth (Optional[int], optional): The recursion depth, None for all levels. Defaults to None.
 
-        return dependency_tree
+        Returns:
+            Dict[str, List[str]]: The dependency tree.
+        """
+        return self.resolve_graph([self.library_name], depth).adjacency
 
     def display_metadata(self) -> None:
         """Display the library's metadata."""
@@ -226,18 +319,9 @@ class LibraryAnalyzer:
                 metadata = Wheel(package_path)
                 raw_dependencies = metadata.requires_dist or []
             elif package_path.endswith(".tar.gz"):
-                with tarfile.open(package_path) as tar:
-                    for member in tar.getmembers():
-                        if member.name == "METADATA":
-                            f = tar.extractfile(member)
-                            if f:
-                                metadata_content = f.read().decode("utf-8")
-                                raw_dependencies = [
-                                    line.split(":", 1)[1].strip()
-                                    for line in metadata_content.splitlines()
-                                    if line.startswith("Requires-Dist:")
-                                ]
-                                break
+                message = read_sdist_metadata(pathlib.Path(package_path))
+                if message is not None:
+                    raw_dependencies = message.get_all("Requires-Dist") or []
             else:
                 raise ValueError("Unsupported package format. Please provide a .whl or .tar.gz file.")
 
@@ -0,0 +1,266 @@
+import fnmatch
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+import typing
+from collections import Counter
+from stat import S_ISREG
+
+from fspacker.core.wheelstore import wheel_store
+from fspacker.settings import settings
+
+__all__ = ["cache_manager"]
+
+# bump when the layout of usage file changes, old usages are dropped
+USAGE_VERSION = 1
+
+ARCHIVE_SUFFIXES = (".whl", ".tar.gz", ".zip")
+
+# suffix of archives renamed aside while evicting, removed by next prune if interrupted
+EVICTING_SUFFIX = ".evicting"
+
+
+class CacheManager:
+    """Size capped LRU cache over archives of libs repo and embed repo.
+
+    Last use of each archive and hit / miss counters are persisted in cache
+    dir. When total size, including objects of wheel store, exceeds the cap,
+    least recently used archives are evicted first, archives never used fall
+    back to their mtime. Archives pinned by lockfile are never evicted, nor
+    archives of a libs repo outside cache dir, given by `FSPACKER_LIBS`.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.usage: typing.Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = CacheManager()
+
+        return cls._instance
+
+    @property
+    def filepath(self) -> pathlib.Path:
+        return settings.cache_dir / "cache-usage.json"
+
+    @property
+    def lockfile(self) -> pathlib.Path:
+        """Default lockfile, one archive name or glob pattern per line."""
+        return settings.cache_dir / "cache.lock"
+
+    @property
+    def repos(self) -> typing.Dict[str, pathlib.Path]:
+        """Repos managed by cache, a libs repo given by user may be shared and is left alone."""
+
+        repos = dict(libs=settings.libs_dir, embed=settings.embed_dir)
+        if settings.libs_dir != settings.cache_dir / "libs-repo":
+            del repos["libs"]
+        return repos
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+
+        self._loaded = True
+        if not self.filepath.exists():
+            return
+
+        try:
+            with open(self.filepath, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Cache usage [{self.filepath.name}] invalid, dropped: {e}")
+            return
+
+        if data.get("version") == USAGE_VERSION:
+            self.usage = data.get("usage", {})
+            self.hits = data.get("hits", 0)
+            self.misses = data.get("misses", 0)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        tmp_file = self.filepath.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(dict(version=USAGE_VERSION, hits=self.hits, misses=self.misses, usage=self.usage), f)
+            os.replace(tmp_file, self.filepath)
+            self._dirty = False
+        except OSError as e:
+            logging.error(f"Save cache usage failed: {e}")
+
+    def touch(self, filepath: pathlib.Path, hit: bool) -> None:
+        """Record use of a cached archive.
+
+        Args:
+            filepath (pathlib.Path): Archive used.
+            hit (bool): Found in cache, False if just downloaded.
+        """
+        with self._lock:
+            self.load()
+            self.usage[os.path.abspath(filepath)] = time.time()
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._dirty = True
+
+    def pins(self, lockfile: typing.Optional[pathlib.Path] = None) -> typing.List[str]:
+        """Patterns of archive names pinned by lockfile, `#` starts a comment."""
+
+        lockfile = lockfile or self.lockfile
+        if not lockfile.exists():
+            return []
+
+        lines = (_.split("#")[0].strip() for _ in lockfile.read_text(encoding="utf-8").splitlines())
+        return [_ for _ in lines if _]
+
+    def archives(self) -> typing.List[typing.Tuple[str, pathlib.Path, os.stat_result]]:
+        """Archives of all repos, as (repo name, file path, stat)."""
+
+        archives = []
+        for repo, directory in self.repos.items():
+            if not directory.exists():
+                continue
+
+            for filepath in directory.rglob("*"):
+                if not filepath.name.endswith(ARCHIVE_SUFFIXES):
+                    continue
+
+                stat = filepath.stat()
+                if S_ISREG(stat.st_mode):
+                    archives.append((repo, filepath, stat))
+        return archives
+
+    def last_used(self, filepath: pathlib.Path, stat: os.stat_result) -> float:
+        return self.usage.get(os.path.abspath(filepath), stat.st_mtime)
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Files and bytes per repo and of wheel store, with size cap and hit rate."""
+
+        self.load()
+        repos = {_: dict(files=0, bytes=0) for _ in self.repos}
+        for repo, _, stat in self.archives():
+            repos[repo]["files"] += 1
+            repos[repo]["bytes"] += stat.st_size
+
+        objects = wheel_store.objects()
+        repos["store"] = dict(files=len(objects), bytes=sum(objects.values()))
+
+        return dict(
+            repos=repos,
+            total=sum(_["bytes"] for _ in repos.values()),
+            max_size=settings.cache_max_size,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hit_rate,
+        )
+
+    def prune(
+        self,
+        max_size: typing.Optional[int] = None,
+        lockfile: typing.Optional[pathlib.Path] = None,
+        dry_run: bool = False,
+    ) -> typing.Tuple[int, int]:
+        """Evict least recently used archives until total size is under cap.
+
+        Each archive is renamed aside before unlinking, so an interrupted
+        prune never leaves a truncated archive in repos. Objects of wheel
+        store count toward total, evicting a wheel also frees objects no
+        other wheel refers to.
+
+        Args:
+            max_size (Optional[int]): Size cap in bytes, `settings.cache_max_size` if None.
+            lockfile (Optional[pathlib.Path]): Lockfile of pinned archives, `cache.lock` in cache dir if None.
+            dry_run (bool): Only report archives to evict.
+
+        Returns:
+            Number of archives evicted and bytes reclaimed.
+        """
+        self.load()
+        max_size = settings.cache_max_size if max_size is None else max_size
+        pins = self.pins(lockfile)
+        if not dry_run:
+            self._remove_leftovers()
+
+        archives = self.archives()
+        references = wheel_store.references()
+        objects = wheel_store.objects()
+        counts = Counter(_ for digests in references.values() for _ in digests)
+        total = sum(stat.st_size for _, _, stat in archives) + sum(objects.values())
+        evicted, reclaimed = 0, 0
+        for _, filepath, stat in sorted(archives, key=lambda x: self.last_used(x[1], x[2])):
+            if total <= max_size:
+                break
+
+            if any(fnmatch.fnmatch(filepath.name, _) for _ in pins):
+                logging.debug(f"Skip pinned archive: [{filepath.name}]")
+                continue
+
+            if not dry_run and not self._evict(filepath):
+                continue
+
+            size = stat.st_size
+            for digest in references.pop(os.path.abspath(filepath), ()):
+                counts[digest] -= 1
+                if not counts[digest]:
+                    size += objects.get(digest, 0)
+
+            logging.info(f"Evict archive: [{filepath.name}], [{size / 1024**2:.2f}]MB with stored members")
+            total -= size
+            evicted += 1
+            reclaimed += size
+
+        if total > max_size:
+            logging.warning(f"Cache size [{total / 1024**2:.2f}]MB still over cap, archives pinned or not managed")
+
+        if evicted and not dry_run:
+            # extracted members of evicted wheels
+            wheel_store.collect()
+
+        self.save()
+        return evicted, reclaimed
+
+    def _evict(self, filepath: pathlib.Path) -> bool:
+        tmp_file = filepath.with_name(filepath.name + EVICTING_SUFFIX)
+        try:
+            os.replace(filepath, tmp_file)
+            os.unlink(tmp_file)
+        except OSError as e:
+            logging.error(f"Evict archive [{filepath.name}] failed: {e}")
+            return False
+
+        if self.usage.pop(os.path.abspath(filepath), None) is not None:
+            self._dirty = True
+        return True
+
+    def _remove_leftovers(self) -> None:
+        for directory in self.repos.values():
+            if not directory.exists():
+                continue
+
+            for filepath in directory.rglob(f"*{EVICTING_SUFFIX}"):
+                try:
+                    filepath.unlink()
+                except OSError as e:
+                    logging.error(f"Remove [{filepath.name}] failed: {e}")
+
+
+cache_manager = CacheManager.get_instance()
@@ -0,0 +1,143 @@
+import importlib.metadata
+import json
+import logging
+import os
+import pathlib
+import sys
+import time
+import typing
+
+from packaging.utils import canonicalize_name
+
+from fspacker.settings import settings
+
+__all__ = ["distributions"]
+
+# bump when the layout of the index changes, old indexes are rebuilt
+INDEX_VERSION = 2
+
+# extension modules at top level, e.g. `_cffi_backend.cp38-win_amd64.pyd`
+_EXTENSION_SUFFIXES = (".py", ".pyd", ".so")
+
+
+def _top_level_names(dist: importlib.metadata.Distribution) -> typing.Set[str]:
+    """Importable top level names of distribution, from `top_level.txt` or `RECORD`."""
+
+    text = dist.read_text("top_level.txt")
+    if text:
+        return set(_.strip().replace("/", ".").split(".")[0] for _ in text.splitlines() if _.strip())
+
+    names = set()
+    for file in dist.files or []:
+        top = file.parts[0]
+        if top in ("..", "__pycache__") or top.endswith((".dist-info", ".egg-info", ".data")):
+            continue
+
+        if len(file.parts) > 1:
+            name = top
+        elif top.endswith(_EXTENSION_SUFFIXES):
+            name = top.split(".")[0]
+        else:
+            continue
+
+        if name.isidentifier():
+            names.add(name)
+    return names
+
+
+class DistributionIndex:
+    """Index of installed distributions by importable top level name and by canonical name.
+
+    Built once from ``importlib.metadata.distributions()`` and persisted in
+    cache dir, the index is rebuilt when `sys.path` or the mtime of any of its
+    directories changes, which happens on every install or uninstall.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.names: typing.Dict[str, str] = {}
+        self.dists: typing.Dict[str, str] = {}
+        self._loaded = False
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = DistributionIndex()
+
+        return cls._instance
+
+    @property
+    def filepath(self) -> pathlib.Path:
+        return settings.cache_dir / "dist-index.json"
+
+    @staticmethod
+    def _signature() -> typing.Dict[str, int]:
+        signature = {}
+        for path in sys.path:
+            try:
+                signature[path] = os.stat(path or ".").st_mtime_ns
+            except OSError:
+                continue
+        return signature
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+
+        self._loaded = True
+        signature = self._signature()
+        try:
+            with open(self.filepath, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("signature") == signature:
+                self.names = data["names"]
+                self.dists = data["dists"]
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self.build()
+        self.save(signature)
+
+    def build(self) -> None:
+        t0 = time.perf_counter()
+        self.names = {}
+        self.dists = {}
+        for dist in importlib.metadata.distributions():
+            dist_name = dist.metadata["Name"]
+            if not dist_name:
+                continue
+
+            self.dists.setdefault(canonicalize_name(dist_name), dist_name)
+            for name in sorted(_top_level_names(dist)):
+                self.names.setdefault(name.lower(), dist_name)
+        logging.info(
+            f"Built distribution index: [{len(self.names)}] import names, used [{time.perf_counter() - t0:.2f}]s"
+        )
+
+    def save(self, signature: typing.Dict[str, int]) -> None:
+        tmp_file = self.filepath.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(dict(version=INDEX_VERSION, signature=signature, names=self.names, dists=self.dists), f)
+            os.replace(tmp_file, self.filepath)
+        except OSError as e:
+            logging.error(f"Save distribution index failed: {e}")
+
+    def lookup(self, import_name: str) -> typing.Optional[str]:
+        """Distribution name providing import name, installed ones first, then `libname_mapper`.
+
+        Names of installed distributions resolve to themselves, e.g. requirements
+        of libraries like `charset-normalizer`.
+        """
+        self.load()
+        dist_name = self.dists.get(canonicalize_name(import_name))
+        if dist_name is not None:
+            return dist_name
+
+        name = import_name.split(".")[0].lower()
+        return self.names.get(name) or settings.libname_mapper.get(name)
+
+
+distributions = DistributionIndex.get_instance()
@@ -0,0 +1,115 @@
+import logging
+import os
+import pathlib
+import typing
+
+__all__ = ["filesystem"]
+
+
+class FileSystemSnapshot:
+    """Snapshot of directory listings, shared by parsers and packers in one build.
+
+    Each directory is listed once with ``os.scandir``, file types are answered
+    from the cached ``os.DirEntry`` objects instead of one ``stat`` per probe,
+    which matters on network mounted workspaces.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.listings: typing.Dict[pathlib.Path, typing.Dict[str, os.DirEntry]] = {}
+        self.scans = 0
+        self.lookups = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = FileSystemSnapshot()
+
+        return cls._instance
+
+    @property
+    def syscalls_saved(self) -> int:
+        return self.lookups - self.scans
+
+    def clear(self) -> None:
+        self.listings.clear()
+        self.scans = 0
+        self.lookups = 0
+
+    def invalidate(self, paths: typing.Iterable[pathlib.Path]) -> None:
+        """Drop listings of changed paths and their parent directories."""
+
+        for path in paths:
+            self.listings.pop(path, None)
+            self.listings.pop(path.parent, None)
+
+    def listdir(self, directory: pathlib.Path) -> typing.Dict[str, os.DirEntry]:
+        """Entries of directory by name, empty if directory doesn't exist."""
+
+        self.lookups += 1
+        listing = self.listings.get(directory)
+        if listing is None:
+            self.scans += 1
+            try:
+                with os.scandir(directory) as it:
+                    listing = {_.name: _ for _ in it}
+            except OSError:
+                listing = {}
+            self.listings[directory] = listing
+
+        return listing
+
+    def is_dir(self, path: pathlib.Path) -> bool:
+        entry = self.listdir(path.parent).get(path.name)
+        return entry is not None and entry.is_dir()
+
+    def is_file(self, path: pathlib.Path) -> bool:
+        entry = self.listdir(path.parent).get(path.name)
+        return entry is not None and entry.is_file()
+
+    def children(self, directory: pathlib.Path) -> typing.List[pathlib.Path]:
+        return sorted(directory / _ for _ in self.listdir(directory))
+
+    def walk(self, directory: pathlib.Path, ignore: typing.Callable[[str], bool]) -> typing.Iterator[pathlib.Path]:
+        """Files under directory recursively, skipping names matched by ignore."""
+
+        for name, entry in sorted(self.listdir(directory).items()):
+            if ignore(name):
+                continue
+
+            if entry.is_dir():
+                yield from self.walk(directory / name, ignore)
+            elif entry.is_file():
+                yield directory / name
+
+    def find(self, directory: pathlib.Path, stem: str) -> typing.Optional[pathlib.Path]:
+        """Entry of directory with given stem, folders first."""
+
+        candidates = sorted(
+            (not entry.is_dir(), name)
+            for name, entry in self.listdir(directory).items()
+            if pathlib.Path(name).stem == stem
+        )
+        return directory / candidates[0][1] if candidates else None
+
+    def resolve_import(self, root_dir: pathlib.Path, import_str: str) -> typing.Optional[pathlib.Path]:
+        """Local path of import string, package folder or module file, None if not local."""
+
+        *parents, name = import_str.split(".")
+        directory = root_dir.joinpath(*parents)
+        listing = self.listdir(directory)
+        if (entry := listing.get(name)) is not None and entry.is_dir():
+            return directory / name
+        if (entry := listing.get(f"{name}.py")) is not None and entry.is_file():
+            return directory / entry.name
+        return None
+
+    def report(self) -> None:
+        logging.info(
+            f"Filesystem snapshot: [{self.scans}] directories scanned, "
+            f"[{self.lookups}] lookups, [{self.syscalls_saved}] syscalls saved"
+        )
+
+
+filesystem = FileSystemSnapshot.get_instance()
@@ -0,0 +1,87 @@
+import pathlib
+import typing
+
+__all__ = ["ImportGraph"]
+
+
+class ImportGraph:
+    """Directed graph of local modules, edges point from importer to imported."""
+
+    def __init__(self):
+        self.edges: typing.Dict[pathlib.Path, typing.Set[pathlib.Path]] = {}
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def __contains__(self, node: pathlib.Path) -> bool:
+        return node in self.edges
+
+    def __iter__(self) -> typing.Iterator[pathlib.Path]:
+        return iter(self.edges)
+
+    def __repr__(self):
+        return f"ImportGraph(nodes={len(self.edges)}, edges={sum(len(v) for v in self.edges.values())})"
+
+    def add_node(self, node: pathlib.Path) -> None:
+        self.edges.setdefault(node, set())
+
+    def add_edge(self, src: pathlib.Path, dst: pathlib.Path) -> None:
+        self.edges.setdefault(src, set()).add(dst)
+        self.add_node(dst)
+
+    def successors(self, node: pathlib.Path) -> typing.Set[pathlib.Path]:
+        return self.edges.get(node, set())
+
+    def predecessors(self, node: pathlib.Path) -> typing.Set[pathlib.Path]:
+        return set(src for src, dsts in self.edges.items() if node in dsts)
+
+    def cycles(self) -> typing.List[typing.List[pathlib.Path]]:
+        """Find import cycles, as strongly connected components (Tarjan, iterative).
+
+        Returns:
+            Components with more than one module, or a module importing itself.
+        """
+        index: typing.Dict[pathlib.Path, int] = {}
+        lowlink: typing.Dict[pathlib.Path, int] = {}
+        stack: typing.List[pathlib.Path] = []
+        on_stack: typing.Set[pathlib.Path] = set()
+        result: typing.List[typing.List[pathlib.Path]] = []
+
+        for root in sorted(self.edges):
+            if root in index:
+                continue
+
+            work = [(root, iter(sorted(self.edges[root])))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.edges[child]))))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.edges[node]:
+                        result.append(sorted(component))
+
+        return result
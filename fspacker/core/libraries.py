@@ -1,8 +1,5 @@
-from fspacker.settings import settings
+from fspacker.core.distributions import distributions
 
 
 def _map_libname(libname: str) -> str:
-    if libname in settings.libname_mapper:
-        return settings.libname_mapper[libname]
-
-    return libname
+    return distributions.lookup(libname) or libname
@@ -0,0 +1,257 @@
+import functools
+import json
+import logging
+import os
+import pathlib
+import sys
+import time
+import typing
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISREG
+
+import packaging.tags
+import packaging.utils
+import packaging.version
+from pkginfo import Distribution
+from pkginfo import Wheel
+
+from fspacker.core.libraryinfo import LibraryInfo
+from fspacker.settings import settings
+from fspacker.utils.zip import read_sdist_metadata
+
+__all__ = ["libs_index"]
+
+# bump when the layout of entries changes, old indexes are rebuilt
+INDEX_VERSION = 1
+
+ARCHIVE_SUFFIXES = (".whl", ".tar.gz")
+
+# sdists are built while installing, ranked after every compatible wheel
+SDIST_RANK = sys.maxsize
+
+
+@functools.lru_cache(maxsize=None)
+def ranked_tags(python_version: str, platform: str) -> typing.Dict[str, int]:
+    """Wheel tags compatible with a runtime and their rank, lower is better, cached per runtime.
+
+    Args:
+        python_version (str): Short python version of runtime, e.g. `3.8`.
+        platform (str): Platform tag of runtime, e.g. `win_amd64`.
+    """
+    version = tuple(int(_) for _ in python_version.split(".")[:2])
+    tags = [
+        *packaging.tags.cpython_tags(version, platforms=[platform]),
+        *packaging.tags.compatible_tags(version, f"cp{version[0]}{version[1]}", [platform]),
+    ]
+    ranks: typing.Dict[str, int] = {}
+    for tag in tags:
+        ranks.setdefault(str(tag), len(ranks))
+    return ranks
+
+
+def wheel_tags(filename: str) -> typing.FrozenSet[str]:
+    """Tags of wheel from PEP 427 file name, empty if invalid."""
+
+    try:
+        *_, tags = packaging.utils.parse_wheel_filename(filename)
+    except (packaging.utils.InvalidWheelFilename, packaging.version.InvalidVersion):
+        return frozenset()
+    return frozenset(str(_) for _ in tags)
+
+
+def _read_metadata(filepath: pathlib.Path) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Read name, version and requirements of a wheel or sdist, None if invalid."""
+
+    if filepath.suffix != ".whl":
+        message = read_sdist_metadata(filepath)
+        if message is None or not message.get("Name"):
+            logging.warning(f"No valid metadata found in [{filepath.name}]")
+            return None
+
+        return dict(
+            name=message["Name"],
+            version=message.get("Version", ""),
+            requires=message.get_all("Requires-Dist") or [],
+        )
+
+    try:
+        meta_data = Wheel(str(filepath))
+    except (ValueError, OSError, zipfile.BadZipFile) as e:
+        logging.error(f"Error reading metadata from [{filepath.name}]: {e}")
+        return None
+
+    if not meta_data.name:
+        logging.warning(f"No valid metadata found in [{filepath.name}]")
+        return None
+
+    return dict(name=meta_data.name, version=meta_data.version or "", requires=list(meta_data.requires_dist))
+
+
+def _version_key(version: typing.Optional[str]) -> typing.Tuple[int, typing.Any]:
+    try:
+        return 1, packaging.version.Version(version or "")
+    except packaging.version.InvalidVersion:
+        return 0, version or ""
+
+
+class LibraryIndex:
+    """Persistent metadata index of archives in libs repo.
+
+    Entries are keyed by file path and valid while (size, mtime_ns) of the
+    archive are unchanged, only new or changed archives are opened, in a
+    thread pool.
+    """
+
+    MAX_WORKERS = 8
+
+    _instance = None
+
+    def __init__(self):
+        self.entries: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        # (normalized name, version, tag) -> compatible wheel
+        self.files: typing.Dict[typing.Tuple[str, str, str], pathlib.Path] = {}
+        self.reads = 0
+        self._loaded = False
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = LibraryIndex()
+
+        return cls._instance
+
+    @property
+    def filepath(self) -> pathlib.Path:
+        return settings.cache_dir / "libs-index.json"
+
+    @property
+    def runtime_tags(self) -> typing.Dict[str, int]:
+        """Ranked tags of the embed runtime packed, see `settings.embed_filename`."""
+        return ranked_tags(settings.python_ver_short, settings.target_platform)
+
+    def rank(self, filepath: pathlib.Path) -> typing.Optional[int]:
+        """Rank of archive for embed runtime, None if incompatible."""
+
+        if filepath.suffix != ".whl":
+            return SDIST_RANK
+
+        ranks = [self.runtime_tags[_] for _ in wheel_tags(filepath.name) if _ in self.runtime_tags]
+        return min(ranks) if ranks else None
+
+    def lookup(self, name: str, version: str, tag: str) -> typing.Optional[pathlib.Path]:
+        """Compatible wheel of (name, version, tag), from last candidates listing."""
+        return self.files.get((packaging.utils.canonicalize_name(name), version, tag))
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+
+        self._loaded = True
+        if not self.filepath.exists():
+            return
+
+        try:
+            with open(self.filepath, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Libs index [{self.filepath.name}] invalid, rebuilding: {e}")
+            return
+
+        if data.get("version") == INDEX_VERSION:
+            self.entries = data.get("entries", {})
+
+    def save(self) -> None:
+        tmp_file = self.filepath.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(dict(version=INDEX_VERSION, entries=self.entries), f)
+            os.replace(tmp_file, self.filepath)
+        except OSError as e:
+            logging.error(f"Save libs index failed: {e}")
+
+    def update(self, libs_dir: pathlib.Path) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Sync index with archives under libs dir, recursively.
+
+        Returns:
+            Entries of valid archives, by file path.
+        """
+        self.load()
+        t0 = time.perf_counter()
+        entries: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        missing: typing.List[typing.Tuple[str, os.stat_result]] = []
+        for filepath in libs_dir.rglob("*"):
+            if not filepath.name.endswith(ARCHIVE_SUFFIXES):
+                continue
+
+            stat = filepath.stat()
+            if not S_ISREG(stat.st_mode):
+                continue
+
+            key = os.path.abspath(filepath)
+            entry = self.entries.get(key)
+            if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                entries[key] = entry
+            else:
+                missing.append((key, stat))
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                results = executor.map(_read_metadata, (pathlib.Path(key) for key, _ in missing))
+                for (key, stat), meta_data in zip(missing, results):
+                    entries[key] = dict(size=stat.st_size, mtime_ns=stat.st_mtime_ns, meta_data=meta_data)
+            self.reads += len(missing)
+
+        changed = bool(missing) or entries.keys() != self.entries.keys()
+        self.entries = entries
+        if changed:
+            self.save()
+
+        logging.info(
+            f"Libs repo index: [{len(entries)}] archives, [{len(missing)}] read, used [{time.perf_counter() - t0:.2f}]s"
+        )
+        return {k: v for k, v in entries.items() if v["meta_data"] is not None}
+
+    def get_candidates(self, libs_dir: pathlib.Path) -> typing.Dict[str, typing.List[LibraryInfo]]:
+        """Archives of libs repo compatible with embed runtime, by normalized name.
+
+        Each version appears once with its best ranked archive, highest version first.
+        """
+        best: typing.Dict[typing.Tuple[str, str], typing.Tuple[int, str]] = {}
+        entries = self.update(libs_dir)
+        self.files.clear()
+        for key, entry in sorted(entries.items()):
+            filepath = pathlib.Path(key)
+            rank = self.rank(filepath)
+            if rank is None:
+                logging.debug(f"Skip wheel incompatible with [{settings.target_platform}]: [{filepath.name}]")
+                continue
+
+            name = packaging.utils.canonicalize_name(entry["meta_data"]["name"])
+            version = entry["meta_data"]["version"]
+            for tag in wheel_tags(filepath.name):
+                if tag in self.runtime_tags:
+                    self.files[(name, version, tag)] = filepath
+            if (name, version) not in best or rank < best[(name, version)][0]:
+                best[(name, version)] = (rank, key)
+
+        candidates: typing.Dict[str, typing.List[LibraryInfo]] = {}
+        for (dist_name, _), (_, key) in best.items():
+            meta_data = entries[key]["meta_data"]
+            distribution = Distribution()
+            distribution.name = meta_data["name"]
+            distribution.version = meta_data["version"]
+            distribution.requires_dist = tuple(meta_data["requires"])
+            candidates.setdefault(dist_name, []).append(LibraryInfo(meta_data=distribution, filepath=pathlib.Path(key)))
+
+        for infos in candidates.values():
+            infos.sort(key=lambda x: _version_key(x.meta_data.version), reverse=True)
+        return candidates
+
+    def get_repo(self, libs_dir: pathlib.Path) -> typing.Dict[str, LibraryInfo]:
+        """Best archive of libs repo by normalized name, highest compatible version if several."""
+
+        return {name: infos[0] for name, infos in self.get_candidates(libs_dir).items()}
+
+
+libs_index = LibraryIndex.get_instance()
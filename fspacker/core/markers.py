@@ -0,0 +1,101 @@
+import logging
+import typing
+
+import packaging.requirements
+import packaging.utils
+
+from fspacker.settings import settings
+
+__all__ = ["markers"]
+
+# platform tag of embed runtime -> platform.machine() on that runtime
+PLATFORM_MACHINES = dict(
+    win_amd64="AMD64",
+    win32="x86",
+    win_arm64="ARM64",
+)
+
+
+class MarkerEvaluator:
+    """Evaluate requirement markers against the packed runtime, not the build host.
+
+    The runtime is the Windows embed python of ``settings.python_ver`` for
+    ``settings.target_platform``. Requirements skipped while packing are
+    recorded by normalized name, for reporting.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.skipped: typing.Dict[str, str] = {}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = MarkerEvaluator()
+
+        return cls._instance
+
+    @property
+    def environment(self) -> typing.Dict[str, str]:
+        """PEP 508 marker environment of the target runtime."""
+
+        return dict(
+            implementation_name="cpython",
+            implementation_version=settings.python_ver,
+            os_name="nt",
+            platform_machine=PLATFORM_MACHINES.get(settings.target_platform, "AMD64"),
+            platform_python_implementation="CPython",
+            platform_release="10",
+            platform_system="Windows",
+            platform_version="10.0.19045",
+            python_full_version=settings.python_ver,
+            python_version=settings.python_ver_short,
+            sys_platform="win32",
+        )
+
+    def is_active(
+        self,
+        requirement: packaging.requirements.Requirement,
+        extras: typing.Iterable[str] = (),
+        environment: typing.Optional[typing.Dict[str, str]] = None,
+    ) -> bool:
+        """Whether requirement applies on target runtime, with given extras of the requiring package."""
+
+        if requirement.marker is None:
+            return True
+
+        environment = self.environment if environment is None else environment
+        return any(requirement.marker.evaluate(dict(environment, extra=extra)) for extra in ("", *extras))
+
+    def split(
+        self,
+        raw_requirements: typing.Iterable[str],
+        extras: typing.Iterable[str] = (),
+    ) -> typing.Tuple[typing.List[packaging.requirements.Requirement], typing.List[packaging.requirements.Requirement]]:
+        """Parse requirements, and split them into active and skipped ones on target runtime.
+
+        Returns:
+            Active and skipped requirements, invalid ones are dropped.
+        """
+        active, skipped = [], []
+        environment = self.environment
+        for raw in raw_requirements:
+            try:
+                requirement = packaging.requirements.Requirement(raw)
+            except packaging.requirements.InvalidRequirement as e:
+                logging.warning(f"Error parsing dependency '{raw}': {e}")
+                continue
+
+            if self.is_active(requirement, extras, environment):
+                active.append(requirement)
+            else:
+                skipped.append(requirement)
+        return active, skipped
+
+    def record(self, requirements: typing.Iterable[packaging.requirements.Requirement]) -> None:
+        for requirement in requirements:
+            self.skipped.setdefault(packaging.utils.canonicalize_name(requirement.name), str(requirement))
+
+
+markers = MarkerEvaluator.get_instance()
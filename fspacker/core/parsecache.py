@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+import typing
+
+from fspacker.core.scanners import SourceRecord
+from fspacker.settings import settings
+
+__all__ = ["parse_cache"]
+
+# bump when the layout of records changes, old caches are dropped
+CACHE_VERSION = 6
+
+
+def _calc_digest(filepath: pathlib.Path) -> str:
+    with open(filepath, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ParseCache:
+    """Persistent cache of source records, keyed by parser engine and file path.
+
+    An entry is valid while (size, mtime_ns) of the file are unchanged. When
+    only the mtime differs, the content digest decides, so touched or
+    re-checked-out files do not need to be parsed again.
+    """
+
+    MAX_ENTRIES = 50000
+
+    _instance = None
+
+    def __init__(self):
+        self.entries: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._loaded = False
+        self._dirty = False
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = ParseCache()
+
+        return cls._instance
+
+    @property
+    def filepath(self) -> pathlib.Path:
+        return settings.cache_dir / "parse-cache.json"
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+
+        self._loaded = True
+        if not self.filepath.exists():
+            return
+
+        try:
+            with open(self.filepath, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Parse cache [{self.filepath.name}] invalid, rebuilding: {e}")
+            return
+
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("entries", {})
+
+    @staticmethod
+    def key(filepath: pathlib.Path) -> str:
+        """Key of file, engines may not agree on records so each has its own entries."""
+        return f"{settings.parser_engine}:{os.path.abspath(filepath)}"
+
+    def get(self, filepath: pathlib.Path) -> typing.Optional[SourceRecord]:
+        """Get cached record for file, None if missing or outdated."""
+
+        self.load()
+        entry = self.entries.get(self.key(filepath))
+        if entry is not None:
+            stat = os.stat(filepath)
+            if entry["size"] == stat.st_size:
+                if entry["mtime_ns"] != stat.st_mtime_ns and entry["digest"] == _calc_digest(filepath):
+                    entry["mtime_ns"] = stat.st_mtime_ns
+                if entry["mtime_ns"] == stat.st_mtime_ns:
+                    entry["used"] = time.time()
+                    self.hits += 1
+                    self._dirty = True
+                    return SourceRecord.from_dict(entry["record"])
+
+        self.misses += 1
+        return None
+
+    def put(self, filepath: pathlib.Path, record: SourceRecord) -> None:
+        self.load()
+        stat = os.stat(filepath)
+        self.entries[self.key(filepath)] = dict(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            digest=_calc_digest(filepath),
+            used=time.time(),
+            record=record.to_dict(),
+        )
+        self._dirty = True
+
+    def digest(self, filepath: pathlib.Path) -> str:
+        """Content digest of file, from the entry validated or stored in this build if any."""
+
+        entry = self.entries.get(self.key(filepath))
+        return entry["digest"] if entry is not None else _calc_digest(filepath)
+
+    def evict(self, max_entries: typing.Optional[int] = None) -> int:
+        """Drop least recently used entries exceeding max entries.
+
+        Returns:
+            Number of entries evicted.
+        """
+        max_entries = self.MAX_ENTRIES if max_entries is None else max_entries
+        overflow = len(self.entries) - max_entries
+        if overflow <= 0:
+            return 0
+
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["used"])[:overflow]:
+            del self.entries[key]
+
+        self._dirty = True
+        return overflow
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        evicted = self.evict()
+        if evicted:
+            logging.info(f"Evicted [{evicted}] parse cache entries")
+
+        tmp_file = self.filepath.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(dict(version=CACHE_VERSION, entries=self.entries), f)
+            os.replace(tmp_file, self.filepath)
+            self._dirty = False
+        except OSError as e:
+            logging.error(f"Save parse cache failed: {e}")
+
+    def report(self) -> None:
+        logging.info(f"Parse cache: [{self.hits}] hits, [{self.misses}] misses, hit rate [{self.hit_rate * 100:.1f}%]")
+
+
+parse_cache = ParseCache.get_instance()
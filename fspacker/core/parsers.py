@@ -1,12 +1,18 @@
-import ast
+import collections
 import logging
 import pathlib
 import typing
 from abc import ABC
 from abc import abstractmethod
-from io import StringIO
 
+from fspacker.core.filesystem import filesystem
+from fspacker.core.graph import ImportGraph
+from fspacker.core.parsecache import parse_cache
 from fspacker.core.resources import resources
+from fspacker.core.scanners import IMPORT_HARD
+from fspacker.core.scanners import scan_source
+from fspacker.core.scanners import scan_sources
+from fspacker.core.scanners import SourceRecord
 from fspacker.core.target import Dependency
 from fspacker.core.target import PackTarget
 from fspacker.settings import settings
@@ -31,74 +37,116 @@ class FolderParser(BaseParser):
             return
 
         for _, v in parsers.TARGETS.items():
-            if entry.stem in v.code:
+            if entry.stem in v.imports:
                 v.sources.add(entry.stem)
                 logging.info(f"Update pack target: {v}")
 
 
 class SourceParser(BaseParser):
-    """Parse by source code"""
+    """Parse by source code.
+
+    Local modules are visited through a worklist over the import graph, so
+    each file is parsed once per target and import cycles terminate.
+    """
 
     root_dir: pathlib.Path
-    entries: typing.Dict[str, pathlib.Path]
     info: Dependency
-    code_text: StringIO
+    graph: ImportGraph
+    imports: typing.Set[str]
 
     def parse(self, entry: pathlib.Path, root_dir: pathlib.Path) -> None:
         self.root_dir = root_dir
-        self.entries = {}
         self.info = Dependency()
-        self.code_text = StringIO()
-
-        with open(entry, encoding="utf-8") as f:
-            code = "".join(f.readlines())
-            if "def main" in code or "__main__" in code:
-                self._parse_content(entry)
-                parsers.TARGETS[entry.stem] = PackTarget(
-                    src=entry,
-                    depends=self.info,
-                    code=f"{code}{self.code_text.getvalue()}",
-                )
-                logging.info(f"Add pack target{parsers.TARGETS[entry.stem]}")
-
-    def _parse_folder(self, filepath: pathlib.Path) -> None:
-        files: typing.List[pathlib.Path] = list(_ for _ in filepath.iterdir() if _.suffix == ".py")
-        for file in files:
-            self._parse_content(file)
-
-    def _parse_content(self, filepath: pathlib.Path) -> None:
-        """Analyse ast tree from source code"""
-        with open(filepath, encoding="utf-8") as f:
-            content = "".join(f.readlines())
-
-        tree = ast.parse(content, filename=filepath)
-        local_entries = {_.stem: _ for _ in filepath.parent.iterdir()}
-        self.entries.update(local_entries)
-        for entry in self.entries.values():
-            if entry.stem in settings.res_entries:
-                self.info.sources.add(entry.stem)
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
-                if node.module is not None:
-                    self._parse_import_str(node.module)
-            elif isinstance(node, ast.Import):
-                for alias in node.names:
-                    self._parse_import_str(alias.name)
-
-    def _parse_import_str(self, import_str: str) -> None:
+        self.graph = ImportGraph()
+        self.imports = set()
+        self._folders: typing.Dict[pathlib.Path, typing.List[pathlib.Path]] = {}
+        self._parent_dirs: typing.Set[pathlib.Path] = set()
+
+        if self._is_entry(entry):
+            self._parse_sources(entry)
+            parsers.TARGETS[entry.stem] = PackTarget(
+                src=entry,
+                depends=self.info,
+                graph=self.graph,
+                imports=self.imports,
+                digest=parse_cache.digest(entry),
+            )
+            logging.info(f"Add pack target{parsers.TARGETS[entry.stem]}")
+
+    @staticmethod
+    def _is_entry(entry: pathlib.Path) -> bool:
+        """Entries declared by user take precedence over detection from source."""
+
+        if settings.entries:
+            return entry.name in settings.entries or entry.stem in settings.entries
+
+        return parsers.get_record(entry).is_entry
+
+    def _parse_sources(self, entry: pathlib.Path) -> None:
+        """Walk local modules reachable from entry, breadth first."""
+
+        visited = {entry}
+        worklist = collections.deque([entry])
+        self.graph.add_node(entry)
+
+        # user-declared hidden imports, resolved as if imported by entry
+        for import_str in settings.hidden_imports:
+            for dependency in self._parse_import_str(import_str):
+                self.graph.add_edge(entry, dependency)
+                if dependency not in visited:
+                    visited.add(dependency)
+                    worklist.append(dependency)
+
+        while worklist:
+            filepath = worklist.popleft()
+            for dependency in self._parse_content(filepath):
+                self.graph.add_edge(filepath, dependency)
+                if dependency not in visited:
+                    visited.add(dependency)
+                    worklist.append(dependency)
+
+        for cycle in self.graph.cycles():
+            logging.info(f"Import cycle detected: {[_.relative_to(self.root_dir).as_posix() for _ in cycle]}")
+
+    def _parse_folder(self, filepath: pathlib.Path) -> typing.List[pathlib.Path]:
+        if filepath not in self._folders:
+            self._folders[filepath] = [_ for _ in filesystem.children(filepath) if _.suffix == ".py"]
+        return self._folders[filepath]
+
+    def _parse_content(self, filepath: pathlib.Path) -> typing.List[pathlib.Path]:
+        """Analyse imports from source code, returns local modules imported"""
+        record = parsers.get_record(filepath)
+
+        if filepath.parent not in self._parent_dirs:
+            self._parent_dirs.add(filepath.parent)
+            for name in filesystem.listdir(filepath.parent):
+                if (stem := pathlib.Path(name).stem) in settings.res_entries:
+                    self.info.sources.add(stem)
+
+        dependencies: typing.List[pathlib.Path] = []
+        for import_str, kind in zip(record.imports, record.kinds):
+            dependencies.extend(self._parse_import_str(import_str, kind))
+        return dependencies
+
+    def _parse_import_str(self, import_str: str, kind: str = IMPORT_HARD) -> typing.List[pathlib.Path]:
+        """Resolve import string, local modules are always followed, libraries by import policy."""
         imports = import_str.split(".")
-        filepath_ = self.root_dir.joinpath(*imports)
-        if filepath_.is_dir():
+        self.imports.update((import_str, imports[0]))
+        local_path = filesystem.resolve_import(self.root_dir, import_str)
+        if local_path is not None and filesystem.is_dir(local_path):
             # deps folder
-            self._parse_folder(filepath_)
-            self.info.sources.add(import_str.split(".")[0])
-        elif (source_path := filepath_.with_suffix(".py")).is_file():
+            self.info.sources.add(imports[0])
+            return self._parse_folder(local_path)
+        elif local_path is not None:
             # deps file
-            self._parse_content(source_path)
-            self.info.sources.add(import_str.split(".")[0])
+            self.info.sources.add(imports[0])
+            return [local_path]
         else:
             import_name = import_str.split(".")[0].lower()
+            if kind not in settings.import_policy:
+                logging.debug(f"Skip [{kind}] import: [{import_name}]")
+                return []
+
             if import_name not in resources.builtin_repo:
                 # ast lib
                 self.info.libs.add(import_name)
@@ -107,17 +155,56 @@ class SourceParser(BaseParser):
             if import_name in settings.tkinter_libs:
                 self.info.extra.add("tkinter")
 
+            return []
+
 
 class ParserFactory:
     PARSERS: typing.Dict[str, BaseParser] = {}
     TARGETS: typing.Dict[str, PackTarget] = {}
+    RECORDS: typing.Dict[pathlib.Path, SourceRecord] = {}
 
     _instance = None
 
+    def prescan(self, root_dir: pathlib.Path, jobs: int) -> None:
+        """Scan all source files under root dir in parallel before parsing.
+
+        Records are merged into the same cache used by the serial path, so
+        parsing results are identical whichever mode is used.
+        """
+
+        def ignore(name: str) -> bool:
+            return name.startswith(".") or name.lower() in settings.ignore_symbols
+
+        filepaths = [_ for _ in filesystem.walk(root_dir, ignore) if _.suffix == ".py"]
+        missing = []
+        for filepath in filepaths:
+            record = parse_cache.get(filepath)
+            if record is not None:
+                self.RECORDS[filepath] = record
+            else:
+                missing.append(filepath)
+
+        for filepath, record in scan_sources(missing, jobs, settings.parser_engine).items():
+            parse_cache.put(filepath, record)
+            self.RECORDS[filepath] = record
+
+    def get_record(self, filepath: pathlib.Path) -> SourceRecord:
+        """Get import record of source file, scanned at most once per build."""
+
+        record = self.RECORDS.get(filepath)
+        if record is None:
+            record = parse_cache.get(filepath)
+            if record is None:
+                record = scan_source(filepath, settings.parser_engine)
+                parse_cache.put(filepath, record)
+            self.RECORDS[filepath] = record
+
+        return record
+
     def parse(self, entry: pathlib.Path, root_dir: pathlib.Path):
-        if entry.is_dir():
+        if filesystem.is_dir(entry):
             parser = self.PARSERS.get("folder", None)
-        elif entry.is_file() and entry.suffix in ".py":
+        elif filesystem.is_file(entry) and entry.suffix in ".py":
             parser = self.PARSERS.get("source", None)
         else:
             parser = None
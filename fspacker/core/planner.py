@@ -0,0 +1,85 @@
+import dataclasses
+import logging
+import pathlib
+import typing
+
+from fspacker.core.target import Dependency
+from fspacker.core.target import PackTarget
+
+__all__ = ["PackPlan", "WorkUnit", "merge_targets", "plan_targets"]
+
+
+@dataclasses.dataclass
+class WorkUnit:
+    """Unit of packing work, run once per build.
+
+    Attributes:
+        name (str): Unique name of unit, e.g. `library:dist`.
+        packer (str): Name of packer running the unit, key of `Processor.packers`.
+        target (PackTarget): Target packed, merged from several targets for shared units.
+    """
+
+    name: str
+    packer: str
+    target: PackTarget
+
+
+@dataclasses.dataclass
+class PackPlan:
+    """Work units of targets sharing one dist dir.
+
+    Attributes:
+        dist_dir (pathlib.Path): Dist dir shared by targets.
+        targets (List[PackTarget]): Targets packed into dist dir.
+        units (List[WorkUnit]): Units in planned order, base first.
+    """
+
+    dist_dir: pathlib.Path
+    targets: typing.List[PackTarget] = dataclasses.field(default_factory=list)
+    units: typing.List[WorkUnit] = dataclasses.field(default_factory=list)
+
+
+def merge_targets(targets: typing.Sequence[PackTarget]) -> PackTarget:
+    """Target with union of dependencies, packed into dist dir of first target."""
+
+    depends = Dependency()
+    for target in targets:
+        depends.libs |= target.libs
+        depends.sources |= target.sources
+        depends.extra |= target.extra
+    return PackTarget(src=targets[0].src, depends=depends)
+
+
+def plan_targets(targets: typing.Iterable[PackTarget]) -> typing.List[PackPlan]:
+    """Plan packing of targets, work shared by targets of one dist dir runs once.
+
+    Runtime and libraries are packed once for the union of targets, each
+    source is copied by the first target importing it, while `.exe` and
+    `.int` files stay per target.
+    """
+    plans: typing.Dict[pathlib.Path, PackPlan] = {}
+    for target in sorted(targets, key=lambda x: x.src):
+        plans.setdefault(target.dist_dir, PackPlan(dist_dir=target.dist_dir)).targets.append(target)
+
+    for dist_dir, plan in plans.items():
+        name = dist_dir.parent.name
+        shared = merge_targets(plan.targets)
+        plan.units.append(WorkUnit(f"base:{name}", "base", shared))
+
+        copied: typing.Set[str] = set()
+        for target in plan.targets:
+            depends = Dependency()
+            depends.sources = target.sources - copied
+            copied |= depends.sources
+            plan.units.append(WorkUnit(f"depends:{name}/{target.src.stem}", "depends", PackTarget(target.src, depends)))
+            plan.units.append(WorkUnit(f"entry:{name}/{target.src.stem}", "entry", target))
+
+        plan.units.append(WorkUnit(f"runtime:{name}", "runtime", shared))
+        if shared.libs or shared.extra:
+            plan.units.append(WorkUnit(f"library:{name}", "library", shared))
+
+        logging.info(
+            f"Pack plan for [{name}]: [{len(plan.targets)}] targets, [{len(plan.units)}] units, "
+            f"[{len(shared.libs | shared.extra)}] libraries shared"
+        )
+    return list(plans.values())
@@ -0,0 +1,124 @@
+import dataclasses
+import logging
+import typing
+
+import packaging.requirements
+import packaging.specifiers
+import packaging.utils
+
+from fspacker.core.libraryinfo import LibraryInfo
+from fspacker.core.markers import markers
+
+__all__ = ["Resolution", "Resolver"]
+
+Requirement = packaging.requirements.Requirement
+SpecifierSet = packaging.specifiers.SpecifierSet
+
+
+@dataclasses.dataclass
+class Resolution:
+    """Result of resolving requirements over libs repo.
+
+    Attributes:
+        pins (Dict[str, LibraryInfo]): Chosen archive of each package, by normalized name.
+        unresolved (Dict[str, SpecifierSet]): Packages not satisfiable locally, with their combined specifiers.
+        extras (Dict[str, FrozenSet[str]]): Extras whose requirements were added for each pinned package.
+    """
+
+    pins: typing.Dict[str, LibraryInfo] = dataclasses.field(default_factory=dict)
+    unresolved: typing.Dict[str, SpecifierSet] = dataclasses.field(default_factory=dict)
+    extras: typing.Dict[str, typing.FrozenSet[str]] = dataclasses.field(default_factory=dict)
+
+
+class Resolver:
+    """Choose one mutually compatible version per package from libs repo.
+
+    Requirements are visited depth first, newest matching candidate first. The
+    search only backtracks when a later requirement conflicts with a pinned
+    version. Packages without any local candidate matching their own
+    specifier are left unresolved, for downloading.
+    """
+
+    def __init__(self, candidates: typing.Dict[str, typing.List[LibraryInfo]]):
+        """
+        Args:
+            candidates (Dict[str, List[LibraryInfo]]): Archives by normalized name, highest version first.
+        """
+        self.candidates = candidates
+        self.backtracks = 0
+        self._matching: typing.Dict[typing.Tuple[str, str], typing.List[LibraryInfo]] = {}
+        self._requires: typing.Dict[typing.Tuple[str, typing.FrozenSet[str]], typing.List[Requirement]] = {}
+
+    def matching(self, name: str, specifier: SpecifierSet) -> typing.List[LibraryInfo]:
+        """Candidates of package matching specifier, memoized."""
+
+        key = (name, str(specifier))
+        if key not in self._matching:
+            infos = self.candidates.get(name, [])
+            allowed = set(specifier.filter(str(_.meta_data.version) for _ in infos))
+            self._matching[key] = [_ for _ in infos if _.meta_data.version in allowed]
+        return self._matching[key]
+
+    def requires(self, info: LibraryInfo, extras: typing.FrozenSet[str]) -> typing.List[Requirement]:
+        """Requirements of candidate active on target runtime, memoized."""
+
+        key = (str(info.filepath), extras)
+        if key not in self._requires:
+            self._requires[key], _ = markers.split(info.meta_data.requires_dist, extras)
+        return self._requires[key]
+
+    def resolve(self, requirements: typing.Iterable[typing.Union[str, Requirement]]) -> Resolution:
+        pending = tuple(_ if isinstance(_, Requirement) else Requirement(_) for _ in requirements)
+        resolution = self._resolve(pending, Resolution())
+        if resolution is None:
+            logging.warning(f"Conflicting requirements in libs repo, download all: {[str(_) for _ in pending]}")
+            resolution = Resolution(
+                unresolved={packaging.utils.canonicalize_name(_.name): _.specifier for _ in pending}
+            )
+
+        logging.info(
+            f"Resolved [{len(resolution.pins)}] packages, [{len(resolution.unresolved)}] unresolved, "
+            f"[{self.backtracks}] backtracks"
+        )
+        return resolution
+
+    def _resolve(self, pending: typing.Tuple[Requirement, ...], state: Resolution) -> typing.Optional[Resolution]:
+        pins, unresolved, applied = dict(state.pins), dict(state.unresolved), dict(state.extras)
+        for index, requirement in enumerate(pending):
+            name = packaging.utils.canonicalize_name(requirement.name)
+            if name in unresolved:
+                unresolved[name] &= requirement.specifier
+                continue
+
+            if name in pins:
+                if not requirement.specifier.contains(str(pins[name].meta_data.version), prereleases=True):
+                    return None
+                extras = frozenset(requirement.extras) - applied.get(name, frozenset())
+                if extras:
+                    # extras requested later add requirements to the pinned package, once per extra
+                    extra = self.requires(pins[name], extras)
+                    rest = pending[index + 1 :] + tuple(
+                        _ for _ in extra if _ not in self.requires(pins[name], frozenset())
+                    )
+                    applied[name] = applied.get(name, frozenset()) | extras
+                    return self._resolve(rest, Resolution(pins=pins, unresolved=unresolved, extras=applied))
+                continue
+
+            if not self.matching(name, requirement.specifier):
+                unresolved[name] = requirement.specifier
+                continue
+
+            # choice point, constraints already pinned are checked when visited again
+            extras = frozenset(requirement.extras)
+            for info in self.matching(name, requirement.specifier):
+                rest = pending[index + 1 :] + tuple(self.requires(info, extras))
+                resolution = self._resolve(
+                    rest,
+                    Resolution(pins={**pins, name: info}, unresolved=unresolved, extras={**applied, name: extras}),
+                )
+                if resolution is not None:
+                    return resolution
+                self.backtracks += 1
+            return None
+
+        return Resolution(pins=pins, unresolved=unresolved, extras=applied)
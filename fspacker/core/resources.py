@@ -1,8 +1,10 @@
+import threading
 import typing
 from functools import cached_property
 
 from fspacker.core.analyzers import BuiltInLibraryAnalyzer
-from fspacker.core.analyzers import LibraryAnalyzer
+from fspacker.core.libraryinfo import LibraryInfo
+from fspacker.core.libsindex import libs_index
 from fspacker.settings import settings
 
 __all__ = ["resources"]
@@ -11,6 +13,9 @@ __all__ = ["resources"]
 class Resources:
     _instance = None
 
+    def __init__(self):
+        self.lock = threading.RLock()
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
@@ -19,8 +24,15 @@ class Resources:
         return cls._instance
 
     @cached_property
-    def libs_repo(self) -> typing.Dict[str, typing.Dict[str, typing.List[str]]]:
-        return LibraryAnalyzer.analyze_packages_in_directory(settings.libs_dir)
+    def libs_repo(self) -> typing.Dict[str, LibraryInfo]:
+        with self.lock:
+            return libs_index.get_repo(settings.libs_dir)
+
+    def add_library(self, name: str, info: LibraryInfo) -> None:
+        """Add library to libs repo, safe while libraries are installed concurrently."""
+
+        with self.lock:
+            self.libs_repo[name] = info
 
     @cached_property
     def builtin_repo(self) -> typing.Set[str]:
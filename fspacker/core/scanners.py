@@ -0,0 +1,394 @@
+import ast
+import concurrent.futures
+import dataclasses
+import itertools
+import logging
+import os
+import pathlib
+import re
+import typing
+from abc import ABC
+from abc import abstractmethod
+
+__all__ = [
+    "IMPORT_KINDS",
+    "SCANNERS",
+    "SourceRecord",
+    "scan_content",
+    "scan_source",
+    "scan_sources",
+]
+
+
+# import kinds, ordered from weakest to strongest condition
+IMPORT_HARD = "hard"
+IMPORT_PLATFORM = "platform"
+IMPORT_OPTIONAL = "optional"
+IMPORT_TYPE_ONLY = "type-only"
+IMPORT_KINDS = (IMPORT_HARD, IMPORT_PLATFORM, IMPORT_OPTIONAL, IMPORT_TYPE_ONLY)
+
+
+def _stronger(kind: str, other: str) -> str:
+    return max(kind, other, key=IMPORT_KINDS.index)
+
+
+@dataclasses.dataclass
+class SourceRecord:
+    """Compact import record for a single source file.
+
+    Attributes
+    ----------
+    imports: typing.Tuple[str, ...]
+        Imported module strings, in source order.
+    kinds: typing.Tuple[str, ...]
+        Kind of each import, one of ``IMPORT_KINDS``.
+    is_entry: bool
+        Whether the file defines a top level ``main`` function or a
+        ``if __name__ == "__main__"`` guard.
+    """
+
+    imports: typing.Tuple[str, ...]
+    kinds: typing.Tuple[str, ...]
+    is_entry: bool
+
+    __slots__ = ("imports", "kinds", "is_entry")
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return dict(imports=list(self.imports), kinds=list(self.kinds), is_entry=self.is_entry)
+
+    @staticmethod
+    def from_dict(data: typing.Dict[str, typing.Any]) -> "SourceRecord":
+        return SourceRecord(
+            imports=tuple(data["imports"]),
+            kinds=tuple(data["kinds"]),
+            is_entry=data["is_entry"],
+        )
+
+
+class BaseScanner(ABC):
+    """Base class for import scanners"""
+
+    @abstractmethod
+    def scan(self, content: str, filepath: pathlib.Path) -> typing.Optional[SourceRecord]:
+        """Extract import record from source content, None if the result is ambiguous."""
+        pass
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+
+class AstScanner(BaseScanner):
+    """Scan imports by walking the full ast tree.
+
+    Imports are classified by the statements enclosing them: the body of a
+    ``try`` catching ImportError is optional, an ``if TYPE_CHECKING`` block
+    is type-only, and branches testing the platform are platform-conditional.
+    """
+
+    # broad or bare handlers don't mark an import as optional
+    IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError"}
+    PLATFORM_GUARDS = {("sys", "platform"), ("os", "name"), ("platform", "system"), ("platform", "machine")}
+    DYNAMIC_IMPORTS = {"import_module", "__import__"}
+
+    def scan(self, content: str, filepath: pathlib.Path) -> SourceRecord:
+        tree = ast.parse(content, filename=filepath)
+        constants = self._module_constants(tree)
+        found: typing.List[typing.Tuple[int, int, typing.List[str], str]] = []
+        stack: typing.List[typing.Tuple[ast.AST, str]] = [(tree, IMPORT_HARD)]
+        while stack:
+            node, kind = stack.pop()
+            if isinstance(node, ast.ImportFrom):
+                found.append((node.lineno, node.col_offset, [node.module] if node.module else [], kind))
+            elif isinstance(node, ast.Import):
+                found.append((node.lineno, node.col_offset, [alias.name for alias in node.names], kind))
+            elif isinstance(node, ast.Try):
+                body_kind = _stronger(kind, IMPORT_OPTIONAL) if self._catches_import_error(node) else kind
+                stack.extend((child, body_kind) for child in node.body + node.orelse)
+                stack.extend((child, kind) for child in [*node.handlers, *node.finalbody])
+            elif isinstance(node, ast.If) and (guard := self._guard_kind(node.test)) is not None:
+                stack.extend((child, _stronger(kind, guard)) for child in node.body)
+                else_kind = kind if guard == IMPORT_TYPE_ONLY else _stronger(kind, guard)
+                stack.extend((child, else_kind) for child in node.orelse)
+            else:
+                if isinstance(node, ast.Call) and (name := self._dynamic_import(node, constants)) is not None:
+                    found.append((node.lineno, node.col_offset, [name], kind))
+                stack.extend((child, kind) for child in ast.iter_child_nodes(node))
+
+        # keep source order, same as the statement scanner
+        imports: typing.List[str] = []
+        kinds: typing.List[str] = []
+        for *_, names, kind in sorted(found, key=lambda x: x[:2]):
+            imports.extend(names)
+            kinds.extend(kind for _ in names)
+
+        return SourceRecord(imports=tuple(imports), kinds=tuple(kinds), is_entry=self._is_entry(tree))
+
+    @staticmethod
+    def _is_entry(tree: ast.Module) -> bool:
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "main":
+                return True
+
+            if isinstance(node, ast.If) and isinstance(test := node.test, ast.Compare):
+                operands = [test.left, *test.comparators]
+                if len(operands) == 2 and isinstance(test.ops[0], ast.Eq):
+                    names = set(_.id for _ in operands if isinstance(_, ast.Name))
+                    values = set(_.value for _ in operands if isinstance(_, ast.Constant))
+                    if names == {"__name__"} and values == {"__main__"}:
+                        return True
+        return False
+
+    def _module_constants(self, tree: ast.Module) -> typing.Dict[str, str]:
+        """String constants assigned at module level, e.g. plugin package names."""
+
+        constants: typing.Dict[str, str] = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                targets, value = node.targets, node.value
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets, value = [node.target], node.value
+            else:
+                continue
+
+            resolved = self._resolve_str(value, constants)
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    if resolved is None:
+                        constants.pop(target.id, None)
+                    else:
+                        constants[target.id] = resolved
+        return constants
+
+    def _resolve_str(self, node: ast.expr, constants: typing.Dict[str, str]) -> typing.Optional[str]:
+        """Resolve constant, concatenated or simple f-string expression to string."""
+
+        if isinstance(node, ast.Constant):
+            return node.value if isinstance(node.value, str) else None
+        if isinstance(node, ast.Name):
+            return constants.get(node.id)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left = self._resolve_str(node.left, constants)
+            right = self._resolve_str(node.right, constants)
+            return left + right if left is not None and right is not None else None
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.FormattedValue):
+                    if value.conversion != -1 or value.format_spec is not None:
+                        return None
+                    value = value.value
+                if (part := self._resolve_str(value, constants)) is None:
+                    return None
+                parts.append(part)
+            return "".join(parts)
+        return None
+
+    def _dynamic_import(self, node: ast.Call, constants: typing.Dict[str, str]) -> typing.Optional[str]:
+        """Module name of ``importlib.import_module`` or ``__import__`` call, if resolvable."""
+
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name not in self.DYNAMIC_IMPORTS or not node.args:
+            return None
+
+        module = self._resolve_str(node.args[0], constants)
+        if not module:
+            return None
+
+        if module.startswith("."):
+            if name != "import_module" or len(node.args) < 2:
+                return None
+            package = self._resolve_str(node.args[1], constants)
+            if package is None:
+                return None
+            level = len(module) - len(module.lstrip("."))
+            parts = package.split(".")[: len(package.split(".")) - level + 1]
+            module = ".".join([*parts, module.lstrip(".")]).strip(".")
+
+        return module or None
+
+    def _catches_import_error(self, node: ast.Try) -> bool:
+        for handler in node.handlers:
+            if handler.type is None:
+                continue
+
+            for name in ast.walk(handler.type):
+                if isinstance(name, ast.Name) and name.id in self.IMPORT_ERRORS:
+                    return True
+                if isinstance(name, ast.Attribute) and name.attr in self.IMPORT_ERRORS:
+                    return True
+        return False
+
+    def _guard_kind(self, test: ast.expr) -> typing.Optional[str]:
+        kind = None
+        for node in ast.walk(test):
+            if isinstance(node, ast.Name) and node.id == "TYPE_CHECKING":
+                return IMPORT_TYPE_ONLY
+            if isinstance(node, ast.Attribute):
+                if node.attr == "TYPE_CHECKING":
+                    return IMPORT_TYPE_ONLY
+                if isinstance(node.value, ast.Name) and (node.value.id, node.attr) in self.PLATFORM_GUARDS:
+                    kind = IMPORT_PLATFORM
+        return kind
+
+
+class StatementScanner(BaseScanner):
+    """Scan imports by a bounded statement scan over the raw text.
+
+    Strings and comments are skipped with a single compiled pattern, and
+    import statements are only accepted as whole, unindented lines, which
+    are always hard imports. Anything else that looks like an import, e.g.
+    an indented import, a backslash continued one or a dynamic import call,
+    is reported as ambiguous so that the ast scanner is used instead.
+    """
+
+    PATTERN = re.compile(
+        r"""
+        (?P<comment>\#[^\r\n]*)
+        |(?P<entry>^(?:async[ \t]+)?def[ \t]+main\b
+            |^if[ \t]+(?:__name__[ \t]*==[ \t]*(?:"__main__"|'__main__')
+                |(?:"__main__"|'__main__')[ \t]*==[ \t]*__name__)[ \t]*:)
+        |(?P<string>(?:\b[rRbBuUfF]{1,2})?(?:\"\"\"|'''|"|'))
+        |(?P<statement>^[ \t]*(?:import|from)\b[^\r\n\#;\\]*)
+        |(?P<keyword>\bimport\b|\bimport_module\b|\b__import__\b)
+        """,
+        re.MULTILINE | re.VERBOSE,
+    )
+    IMPORT_PATTERN = re.compile(r"[ \t]*import[ \t]+(.+?)[ \t]*")
+    FROM_PATTERN = re.compile(r"[ \t]*from[ \t]+\.*([\w.]*)[ \t]+import\b.*")
+    NAME_PATTERN = re.compile(r"([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)(?:[ \t]+as[ \t]+[A-Za-z_]\w*)?")
+
+    def scan(self, content: str, filepath: pathlib.Path) -> typing.Optional[SourceRecord]:
+        imports: typing.List[str] = []
+        is_entry = False
+        pos = 0
+        while (match := self.PATTERN.search(content, pos)) is not None:
+            pos = match.end()
+            kind = match.lastgroup
+            if kind == "entry":
+                is_entry = True
+            elif kind == "string":
+                delimiter = match.group().lstrip("rRbBuUfF")
+                pos = self._skip_string(content, pos, delimiter)
+                if pos < 0:
+                    return None
+            elif kind == "statement":
+                if content[pos : pos + 1] in (";", "\\") or match.group()[0] in " \t":
+                    return None
+                names = self._parse_statement(match.group())
+                if names is None:
+                    return None
+                imports.extend(names)
+            elif kind == "keyword":
+                return None
+
+        # main guard in a form not matched, e.g. parenthesized, ast scanner decides
+        if not is_entry and "__main__" in content:
+            return None
+
+        return SourceRecord(imports=tuple(imports), kinds=(IMPORT_HARD,) * len(imports), is_entry=is_entry)
+
+    @staticmethod
+    def _skip_string(content: str, pos: int, delimiter: str) -> int:
+        """Find end of string literal, -1 if not terminated.
+
+        Searching for the closing quote directly is much faster than matching
+        escape sequences one by one, e.g. for large generated byte literals.
+        """
+
+        while (end := content.find(delimiter, pos)) >= 0:
+            backslashes = 0
+            while content[end - backslashes - 1] == "\\":
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return end + len(delimiter)
+            pos = end + 1
+        return -1
+
+    def _parse_statement(self, statement: str) -> typing.Optional[typing.List[str]]:
+        if (match := self.FROM_PATTERN.fullmatch(statement)) is not None:
+            return [match.group(1)] if match.group(1) else []
+
+        if (match := self.IMPORT_PATTERN.fullmatch(statement)) is not None:
+            names = []
+            for alias in match.group(1).split(","):
+                if (name := self.NAME_PATTERN.fullmatch(alias.strip())) is None:
+                    return None
+                names.append(name.group(1))
+            return names
+
+        return None
+
+
+_ast_scanner = AstScanner()
+SCANNERS: typing.Dict[str, BaseScanner] = dict(
+    ast=_ast_scanner,
+    scan=StatementScanner(),
+)
+
+
+def scan_content(content: str, filepath: pathlib.Path, engine: str = "ast") -> SourceRecord:
+    """Extract imported modules from source content.
+
+    Args:
+        content: Source code.
+        filepath: Source file path, used for error messages.
+        engine: Scanner engine name, falls back to ``ast`` on ambiguous sources.
+
+    Returns:
+        Import record of the content.
+    """
+
+    record = SCANNERS[engine].scan(content, filepath)
+    if record is None:
+        logging.debug(f"Ambiguous imports in [{filepath.name}], fallback to ast scanner")
+        record = _ast_scanner.scan(content, filepath)
+
+    return record
+
+
+def scan_source(filepath: pathlib.Path, engine: str = "ast") -> SourceRecord:
+    """Extract imported modules from source file, see ``scan_content``."""
+
+    with open(filepath, encoding="utf-8") as f:
+        return scan_content(f.read(), filepath, engine)
+
+
+def _scan_source_safe(filepath: pathlib.Path, engine: str) -> typing.Optional[SourceRecord]:
+    """Worker function, invalid files are left for the serial path to report."""
+
+    try:
+        return scan_source(filepath, engine)
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return None
+
+
+def scan_sources(
+    filepaths: typing.Sequence[pathlib.Path],
+    jobs: int,
+    engine: str = "ast",
+) -> typing.Dict[pathlib.Path, SourceRecord]:
+    """Scan source files in a process pool.
+
+    Args:
+        filepaths: Source files to scan.
+        jobs: Number of worker processes, 0 for all available cores.
+        engine: Scanner engine name.
+
+    Returns:
+        Mapping of file path to import record, files failed to scan are omitted.
+    """
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if not len(filepaths):
+        return {}
+
+    chunksize = max(1, len(filepaths) // (jobs * 4))
+    logging.info(f"Scanning [{len(filepaths)}] source files with [{jobs}] jobs")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            _scan_source_safe,
+            filepaths,
+            itertools.repeat(engine),
+            chunksize=chunksize,
+        )
+        return {path: record for path, record in zip(filepaths, results) if record is not None}
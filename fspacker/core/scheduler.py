@@ -0,0 +1,124 @@
+import dataclasses
+import logging
+import pathlib
+import time
+import typing
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+__all__ = ["Stage", "StageScheduler"]
+
+
+@dataclasses.dataclass
+class Stage:
+    """Stage of build, with the paths it reads and writes.
+
+    Attributes:
+        name (str): Unique name of stage.
+        run (Callable[[], None]): Work of stage.
+        inputs (Set[pathlib.Path]): Paths read by stage.
+        outputs (Set[pathlib.Path]): Paths written by stage, including everything under them.
+    """
+
+    name: str
+    run: typing.Callable[[], None]
+    inputs: typing.Set[pathlib.Path] = dataclasses.field(default_factory=set)
+    outputs: typing.Set[pathlib.Path] = dataclasses.field(default_factory=set)
+
+
+def _overlaps(paths: typing.Set[pathlib.Path], others: typing.Set[pathlib.Path]) -> bool:
+    """Any path equals, contains or is contained by one of others."""
+
+    return any(a == b or a in b.parents or b in a.parents for a in paths for b in others)
+
+
+class StageScheduler:
+    """Run stages as a DAG on a thread pool.
+
+    A stage depends on every stage added before it that writes what it reads
+    or writes, or reads what it writes. Independent stages run concurrently,
+    wall time of each stage is recorded to report the critical path.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.stages: typing.Dict[str, Stage] = {}
+        self.times: typing.Dict[str, typing.Tuple[float, float]] = {}
+
+    def add(self, stage: Stage) -> None:
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage [{stage.name}]")
+
+        self.stages[stage.name] = stage
+
+    def dependencies(self) -> typing.Dict[str, typing.Set[str]]:
+        """Direct dependencies of each stage, by stage name."""
+
+        depends: typing.Dict[str, typing.Set[str]] = {}
+        stages = list(self.stages.values())
+        for i, stage in enumerate(stages):
+            depends[stage.name] = set(
+                _.name
+                for _ in stages[:i]
+                if _overlaps(_.outputs, stage.inputs | stage.outputs) or _overlaps(_.inputs, stage.outputs)
+            )
+        return depends
+
+    def run(self) -> None:
+        """Run all stages, a failing stage raises after running stages finish."""
+
+        pending = self.dependencies()
+        done: typing.Set[str] = set()
+        running: typing.Dict[Future, str] = {}
+        self.times.clear()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                for name in [k for k, v in pending.items() if v <= done]:
+                    del pending[name]
+                    running[executor.submit(self._run_stage, self.stages[name])] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    future.result()
+                    done.add(name)
+
+    def _run_stage(self, stage: Stage) -> None:
+        start = time.perf_counter()
+        try:
+            stage.run()
+        finally:
+            self.times[stage.name] = (start, time.perf_counter())
+
+    def critical_path(self) -> typing.Tuple[typing.List[str], float]:
+        """Chain of dependent stages with the longest total time, and the time."""
+
+        depends = self.dependencies()
+        finish: typing.Dict[str, float] = {}
+        previous: typing.Dict[str, typing.Optional[str]] = {}
+        for name in self.stages:
+            start, end = self.times.get(name, (0.0, 0.0))
+            before = max(depends[name], key=lambda x: finish[x], default=None)
+            previous[name] = before
+            finish[name] = (end - start) + (finish[before] if before is not None else 0.0)
+
+        last = max(finish, key=lambda x: finish[x], default=None)
+        total = finish[last] if last is not None else 0.0
+        path = []
+        while last is not None:
+            path.append(last)
+            last = previous[last]
+        return path[::-1], total
+
+    def report(self) -> None:
+        if not self.times:
+            return
+
+        for name, (start, end) in sorted(self.times.items(), key=lambda x: x[1][0]):
+            logging.info(f"Stage [{name}]: used [{end - start:.2f}]s")
+
+        path, total = self.critical_path()
+        wall = max(_[1] for _ in self.times.values()) - min(_[0] for _ in self.times.values())
+        logging.info(f"Critical path: [{' -> '.join(path)}], [{total:.2f}]s of [{wall:.2f}]s wall time")
@@ -2,7 +2,8 @@ import dataclasses
 import pathlib
 import string
 import typing
-from functools import cached_property
+
+from fspacker.core.graph import ImportGraph
 
 __all__ = ["Dependency", "PackTarget"]
 
@@ -40,12 +41,53 @@ class Dependency:
         self.sources = set()
         self.extra = set()
 
+    def copy(self) -> "Dependency":
+        depends = Dependency()
+        depends.libs = set(self.libs)
+        depends.sources = set(self.sources)
+        depends.extra = set(self.extra)
+        return depends
+
 
 @dataclasses.dataclass
 class PackTarget:
+    """Pack target of an entry file, including:
+
+    Attributes
+    ----------
+    src: pathlib.Path
+        Entry source file.
+    depends: Dependency
+        Dependency data of the entry.
+    graph: ImportGraph
+        Graph of local modules imported.
+    imports: typing.Set[str]
+        Imported module names, both full and top level, for O(1) lookups.
+    digest: str
+        Sha256 digest of the entry source.
+    """
+
     src: pathlib.Path
     depends: Dependency
-    code: str
+    graph: ImportGraph
+    imports: typing.Set[str]
+    digest: str
+
+    __slots__ = ("src", "depends", "graph", "imports", "digest")
+
+    def __init__(
+        self,
+        src: pathlib.Path,
+        depends: Dependency,
+        graph: typing.Optional[ImportGraph] = None,
+        imports: typing.Optional[typing.Set[str]] = None,
+        digest: str = "",
+    ):
+        self.src = src
+        self.depends = depends
+        self.graph = ImportGraph() if graph is None else graph
+        self.imports = set() if imports is None else imports
+        self.digest = digest
 
     def __repr__(self):
         return TARGET_TEMPLATE.substitute(
@@ -69,23 +111,23 @@ class PackTarget:
     def extra(self):
         return self.depends.extra
 
-    @cached_property
+    @property
     def lib_folders(self):
         """Library entries already exists in packages dir"""
         return list(x for x in self.packages_dir.iterdir() if x.is_dir())
 
-    @cached_property
+    @property
     def root_dir(self) -> pathlib.Path:
         return self.src.parent
 
-    @cached_property
+    @property
     def dist_dir(self) -> pathlib.Path:
         return self.src.parent / "dist"
 
-    @cached_property
+    @property
     def runtime_dir(self) -> pathlib.Path:
         return self.dist_dir / "runtime"
 
-    @cached_property
+    @property
     def packages_dir(self) -> pathlib.Path:
         return self.dist_dir / "site-packages"
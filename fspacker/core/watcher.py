@@ -0,0 +1,166 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import pathlib
+import select
+import struct
+import sys
+import time
+import typing
+from abc import ABC
+from abc import abstractmethod
+
+from fspacker.settings import settings
+
+__all__ = ["create_watcher"]
+
+
+def _is_ignored(name: str) -> bool:
+    return name.startswith(".") or name.lower() in settings.ignore_symbols
+
+
+class BaseWatcher(ABC):
+    """Base class for file watchers of a project root."""
+
+    # wait for more events after the first one, editors often write in steps
+    SETTLE_TIME = 0.2
+
+    def __init__(self, root_dir: pathlib.Path):
+        self.root_dir = root_dir
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+    @abstractmethod
+    def poll(self, timeout: float) -> typing.Set[pathlib.Path]:
+        """Wait at most timeout seconds, returns changed paths."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def wait(self, timeout: float = 1.0) -> typing.Set[pathlib.Path]:
+        """Wait for a batch of changes, blocks until something changed."""
+
+        changes: typing.Set[pathlib.Path] = set()
+        while not changes:
+            changes = self.poll(timeout)
+
+        while more := self.poll(self.SETTLE_TIME):
+            changes |= more
+        return changes
+
+
+class PollingWatcher(BaseWatcher):
+    """Watcher comparing (mtime_ns, size) snapshots of the project tree."""
+
+    def __init__(self, root_dir: pathlib.Path):
+        super().__init__(root_dir)
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> typing.Dict[pathlib.Path, typing.Tuple[int, int]]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root_dir):
+            dirnames[:] = [_ for _ in dirnames if not _is_ignored(_)]
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    continue
+                snapshot[pathlib.Path(filepath)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> typing.Set[pathlib.Path]:
+        time.sleep(timeout)
+        snapshot = self._take_snapshot()
+        changes = set(k for k in snapshot.keys() | self.snapshot.keys() if snapshot.get(k) != self.snapshot.get(k))
+        self.snapshot = snapshot
+        return changes
+
+    def close(self) -> None:
+        self.snapshot.clear()
+
+
+class InotifyWatcher(BaseWatcher):
+    """Watcher using linux inotify through libc, without extra dependencies."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, root_dir: pathlib.Path):
+        super().__init__(root_dir)
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.watches: typing.Dict[int, pathlib.Path] = {}
+        self._add_tree(root_dir)
+
+    @staticmethod
+    def is_available() -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+
+        libname = ctypes.util.find_library("c")
+        return libname is not None and hasattr(ctypes.CDLL(libname), "inotify_init1")
+
+    def _add_tree(self, directory: pathlib.Path) -> None:
+        for dirpath, dirnames, _ in os.walk(directory):
+            dirnames[:] = [_ for _ in dirnames if not _is_ignored(_)]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = pathlib.Path(dirpath)
+
+    def poll(self, timeout: float) -> typing.Set[pathlib.Path]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changes = set()
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+            directory = self.watches.get(wd)
+            if directory is None or not name or _is_ignored(name):
+                continue
+
+            path = directory / name
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_tree(path)
+            changes.add(path)
+        return changes
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(root_dir: pathlib.Path) -> BaseWatcher:
+    """Create watcher for root dir, inotify where available, polling otherwise."""
+
+    watcher: BaseWatcher
+    try:
+        watcher = InotifyWatcher(root_dir) if InotifyWatcher.is_available() else PollingWatcher(root_dir)
+    except OSError as e:
+        logging.warning(f"Inotify not available, fallback to polling: {e}")
+        watcher = PollingWatcher(root_dir)
+
+    logging.info(f"Watching [{root_dir}] for changes, using [{watcher}]")
+    return watcher
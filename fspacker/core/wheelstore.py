@@ -0,0 +1,336 @@
+import functools
+import hashlib
+import heapq
+import json
+import logging
+import os
+import pathlib
+import shutil
+import threading
+import time
+import typing
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fspacker.settings import settings
+
+__all__ = ["wheel_store"]
+
+# bump when the layout of manifests changes, wheels are extracted again
+STORE_VERSION = 1
+
+# streaming buffer per member, memory is bounded by workers x buffer
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _is_safe_member(name: str) -> bool:
+    """Member extracts inside destination, no absolute path or parent reference."""
+
+    path = pathlib.PurePosixPath(name)
+    return not path.is_absolute() and ".." not in path.parts and ":" not in name
+
+
+def _split(infos: typing.List[zipfile.ZipInfo], count: int) -> typing.List[typing.List[zipfile.ZipInfo]]:
+    """Split members into batches of similar uncompressed size, largest first."""
+
+    batches: typing.List[typing.List[zipfile.ZipInfo]] = [[] for _ in range(count)]
+    heap = [(0, i) for i in range(count)]
+    for info in sorted(infos, key=lambda x: x.file_size, reverse=True):
+        size, i = heapq.heappop(heap)
+        batches[i].append(info)
+        heapq.heappush(heap, (size + info.file_size, i))
+    return [_ for _ in batches if _]
+
+
+def _preallocate(fd: int, size: int) -> None:
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.truncate(fd, size)
+    except OSError:
+        pass
+
+
+class WheelStore:
+    """Content addressed store of extracted wheel members in cache dir.
+
+    Each wheel is extracted once into ``objects/``, keyed by sha256 of the
+    member content, and a manifest maps member names to their keys. Installs
+    link objects into dist with hardlinks, falling back to copies when
+    linking is not possible, e.g. across filesystems.
+    """
+
+    # wheels larger than threshold are extracted by several threads, each on its own file handle
+    EXTRACT_WORKERS = 4
+    PARALLEL_THRESHOLD = 16 * 1024**2
+    # reserve size of objects before writing, less fragmentation for large members
+    PREALLOCATE = False
+
+    _instance = None
+
+    def __init__(self):
+        self.manifests: typing.Dict[str, typing.Dict[str, str]] = {}
+        self.links = 0
+        self.copies = 0
+        self.extracted_files = 0
+        self.extracted_bytes = 0
+        self.extract_time = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = WheelStore()
+
+        return cls._instance
+
+    @property
+    def store_dir(self) -> pathlib.Path:
+        return settings.cache_dir / "wheel-store"
+
+    @property
+    def objects_dir(self) -> pathlib.Path:
+        return self.store_dir / "objects"
+
+    @property
+    def manifests_dir(self) -> pathlib.Path:
+        return self.store_dir / "manifests"
+
+    def object_path(self, digest: str) -> pathlib.Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def manifest_path(self, filepath: pathlib.Path) -> pathlib.Path:
+        key = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()
+        return self.manifests_dir / f"{key}.json"
+
+    def manifest(self, filepath: pathlib.Path) -> typing.Dict[str, str]:
+        """Digests of wheel members by name, extracting the wheel into store if not yet.
+
+        Manifests are valid while (size, mtime_ns) of the wheel are unchanged.
+        """
+        stat = filepath.stat()
+        key = f"{os.path.abspath(filepath)}:{stat.st_size}:{stat.st_mtime_ns}"
+        if key in self.manifests:
+            return self.manifests[key]
+
+        manifest_path = self.manifest_path(filepath)
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STORE_VERSION and (data["size"], data["mtime_ns"]) == (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                self.manifests[key] = data["files"]
+                return self.manifests[key]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        files = self.extract(filepath)
+        data = dict(
+            version=STORE_VERSION,
+            wheel=os.path.abspath(filepath),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            files=files,
+        )
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = manifest_path.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, manifest_path)
+        except OSError as e:
+            logging.error(f"Save manifest of [{filepath.name}] failed: {e}")
+
+        self.manifests[key] = files
+        return files
+
+    def extract(self, filepath: pathlib.Path) -> typing.Dict[str, str]:
+        """Extract members of wheel into objects, return digests by member name.
+
+        Members are listed once from the central directory and streamed with
+        large buffers. Wheels over `PARALLEL_THRESHOLD` are split into
+        batches of similar size, extracted by threads on independent handles.
+        """
+        t0 = time.perf_counter()
+        with zipfile.ZipFile(filepath, "r") as zip_ref:
+            infos = []
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+
+                if not _is_safe_member(info.filename):
+                    logging.warning(f"Skip unsafe member [{info.filename}] of [{filepath.name}]")
+                    continue
+
+                infos.append(info)
+
+        self._make_fanout()
+        size = sum(_.file_size for _ in infos)
+        workers = self.EXTRACT_WORKERS if size >= self.PARALLEL_THRESHOLD else 1
+        files: typing.Dict[str, str] = {}
+        if workers == 1:
+            files.update(self._extract_batch(filepath, infos))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(functools.partial(self._extract_batch, filepath), _split(infos, workers)):
+                    files.update(result)
+
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self.extracted_files += len(infos)
+            self.extracted_bytes += size
+            self.extract_time += elapsed
+
+        logging.info(
+            f"Stored [{filepath.name}]: [{len(infos)}] files, [{size / 1024**2:.2f}]MB "
+            f"at [{size / 1024**2 / max(elapsed, 1e-9):.2f}]MB/s, [{workers}] threads"
+        )
+        # member order of wheel
+        return {_.filename: files[_.filename] for _ in infos}
+
+    def _make_fanout(self) -> None:
+        """Create all object folders in one pass, instead of one check per member."""
+
+        if (self.objects_dir / "ff").is_dir():
+            return
+
+        for i in range(256):
+            (self.objects_dir / f"{i:02x}").mkdir(parents=True, exist_ok=True)
+
+    def _extract_batch(self, filepath: pathlib.Path, infos: typing.List[zipfile.ZipInfo]) -> typing.Dict[str, str]:
+        with zipfile.ZipFile(filepath, "r") as zip_ref:
+            return {_.filename: self._store(zip_ref, _) for _ in infos}
+
+    def _store(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> str:
+        digest = hashlib.sha256()
+        tmp_file = self.objects_dir / f"{os.getpid()}-{threading.get_ident()}.tmp"
+        with zip_ref.open(info) as src, open(tmp_file, "wb") as dst:
+            if self.PREALLOCATE and info.file_size:
+                _preallocate(dst.fileno(), info.file_size)
+
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                dst.write(chunk)
+
+        object_path = self.object_path(digest.hexdigest())
+        if object_path.exists():
+            tmp_file.unlink()
+        else:
+            os.replace(tmp_file, object_path)
+        return digest.hexdigest()
+
+    def link(self, src: pathlib.Path, dst: pathlib.Path) -> None:
+        """Hardlink object to destination, copy if not possible."""
+
+        try:
+            os.link(src, dst)
+            linked = True
+        except OSError:
+            shutil.copyfile(src, dst)
+            linked = False
+
+        with self._lock:
+            if linked:
+                self.links += 1
+            else:
+                self.copies += 1
+
+    def install(
+        self,
+        filepath: pathlib.Path,
+        dest_dir: pathlib.Path,
+        selected: typing.Callable[[str], bool],
+    ) -> int:
+        """Install members of wheel selected by filter into destination directory.
+
+        Args:
+            filepath (pathlib.Path): Wheel file.
+            dest_dir (pathlib.Path): Destination, e.g. `site-packages` of dist.
+            selected (Callable[[str], bool]): Filter of member names.
+
+        Returns:
+            Number of files installed.
+        """
+        members = [(name, digest) for name, digest in self.manifest(filepath).items() if selected(name)]
+        # directory tree in one pass, parents first
+        for directory in sorted(set((dest_dir / name).parent for name, _ in members)):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for name, digest in members:
+            dst = dest_dir / name
+            if dst.exists():
+                dst.unlink()
+            self.link(self.object_path(digest), dst)
+        return len(members)
+
+    def report(self) -> None:
+        if not self.extracted_files and not self.links and not self.copies:
+            return
+
+        throughput = self.extracted_bytes / 1024**2 / self.extract_time if self.extract_time else 0.0
+        logging.info(
+            f"Wheel store: [{self.extracted_files}] files extracted, [{self.extracted_bytes / 1024**2:.2f}]MB "
+            f"at [{throughput:.2f}]MB/s, [{self.links}] linked, [{self.copies}] copied"
+        )
+
+    def references(self) -> typing.Dict[str, typing.Set[str]]:
+        """Digests of objects referred to by each wheel still in cache, by wheel path."""
+
+        references: typing.Dict[str, typing.Set[str]] = {}
+        for manifest_path in self.manifests_dir.glob("*.json"):
+            try:
+                with open(manifest_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == STORE_VERSION and os.path.exists(data["wheel"]):
+                    references[data["wheel"]] = set(data["files"].values())
+            except (OSError, ValueError, KeyError):
+                pass
+        return references
+
+    def objects(self) -> typing.Dict[str, int]:
+        """Size of each object in store, by digest."""
+
+        return {_.name: _.stat().st_size for _ in self.objects_dir.glob("*/*")}
+
+    def collect(self) -> typing.Tuple[int, int]:
+        """Remove manifests of wheels no longer in cache and objects no manifest refers to.
+
+        Returns:
+            Number of objects removed and bytes reclaimed.
+        """
+        if not self.store_dir.exists():
+            return 0, 0
+
+        referenced: typing.Set[str] = set()
+        for manifest_path in self.manifests_dir.glob("*.json"):
+            try:
+                with open(manifest_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == STORE_VERSION and os.path.exists(data["wheel"]):
+                    referenced.update(data["files"].values())
+                    continue
+            except (OSError, ValueError, KeyError):
+                pass
+            manifest_path.unlink()
+
+        self.manifests.clear()
+        removed, reclaimed = 0, 0
+        for object_path in self.objects_dir.glob("*/*"):
+            if object_path.name in referenced:
+                continue
+
+            size = object_path.stat().st_size
+            try:
+                object_path.unlink()
+            except OSError as e:
+                logging.error(f"Remove object [{object_path.name}] failed: {e}")
+                continue
+            removed += 1
+            reclaimed += size
+        return removed, reclaimed
+
+
+wheel_store = WheelStore.get_instance()
@@ -1,4 +1,5 @@
 import logging
+import pathlib
 import typing
 
 from fspacker.core.target import PackTarget
@@ -14,3 +15,15 @@ class BasePacker:
             logging.info(f"Create folder{'' if len(dirs) == 1 else 's'}: {list(_.name for _ in dirs)}")
             for dir_ in dirs:
                 dir_.mkdir(parents=True)
+
+    def inputs(self, target: PackTarget) -> typing.Set[pathlib.Path]:
+        """Paths read while packing target, outside of outputs."""
+        return set()
+
+    def outputs(self, target: PackTarget) -> typing.Set[pathlib.Path]:
+        """Paths written while packing target, including everything under them."""
+        return {target.dist_dir}
+
+    def update(self, target: PackTarget, files: typing.Iterable[pathlib.Path]) -> None:
+        """Update packed target for changed files, no-op for packers without incremental support."""
+        pass
@@ -1,6 +1,9 @@
 import logging
+import pathlib
 import shutil
+import typing
 
+from fspacker.core.filesystem import filesystem
 from fspacker.core.target import PackTarget
 from fspacker.packers.base import BasePacker
 
@@ -19,8 +22,38 @@ class DependsPacker(BasePacker):
         shutil.copy(str(target.src), str(dst))
 
         for dep in target.sources:
-            dep_target = list(_ for _ in target.src.parent.glob(f"{dep}*"))[0]
-            if dep_target.is_dir():
+            dep_target = filesystem.find(target.src.parent, dep)
+            if dep_target is None:
+                logging.warning(f"Source not found: [{dep}]")
+            elif filesystem.is_dir(dep_target):
                 shutil.copytree(dep_target, str(dst / dep_target.stem), dirs_exist_ok=True)
-            elif dep_target.is_file():
+            elif filesystem.is_file(dep_target):
                 shutil.copy(dep_target, str(dst / dep_target.name))
+
+    def outputs(self, target: PackTarget) -> typing.Set[pathlib.Path]:
+        dst = target.dist_dir / "src"
+        outputs = {dst / target.src.name}
+        for dep in target.sources:
+            dep_target = filesystem.find(target.src.parent, dep)
+            if dep_target is not None:
+                outputs.add(dst / (dep_target.stem if filesystem.is_dir(dep_target) else dep_target.name))
+        return outputs
+
+    def update(self, target: PackTarget, files: typing.Iterable[pathlib.Path]) -> None:
+        """Copy changed source files of target only, removed files are deleted from dist."""
+
+        dst = target.dist_dir / "src"
+        root = target.root_dir
+        for file in files:
+            relative = file.relative_to(root)
+            if file != target.src and pathlib.Path(relative.parts[0]).stem not in target.sources:
+                continue
+
+            dst_file = dst / relative
+            if file.is_file():
+                logging.info(f"Update source file: [{relative}]->[{dst_file.relative_to(root)}]")
+                dst_file.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(str(file), str(dst_file))
+            elif not file.exists() and dst_file.is_file():
+                logging.info(f"Remove source file: [{dst_file.relative_to(root)}]")
+                dst_file.unlink()
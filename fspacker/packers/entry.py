@@ -1,6 +1,8 @@
 import logging
+import pathlib
 import shutil
 import string
+import typing
 
 from fspacker.core.target import PackTarget
 from fspacker.packers.base import BasePacker
@@ -32,6 +34,9 @@ main()
 
 
 class EntryPacker(BasePacker):
+    def outputs(self, target: PackTarget) -> typing.Set[pathlib.Path]:
+        return {target.dist_dir / f"{target.src.stem}.exe", target.dist_dir / f"{target.src.stem}.int"}
+
     def pack(self, target: PackTarget):
         is_gui = target.libs.union(target.extra).intersection(settings.gui_libs)
 
@@ -1,6 +1,15 @@
+import functools
 import logging
+import pathlib
+import typing
+
+from packaging.utils import canonicalize_name
 
 from fspacker.core.analyzers import LibraryAnalyzer
+from fspacker.core.distributions import distributions
+from fspacker.core.libsindex import libs_index
+from fspacker.core.markers import markers
+from fspacker.core.resolver import Resolver
 from fspacker.core.resources import resources
 from fspacker.core.target import PackTarget
 from fspacker.packers.base import BasePacker
@@ -13,7 +22,9 @@ from fspacker.packers.libspec.sci import NumbaSpecPacker
 from fspacker.packers.libspec.sci import NumpySpecPacker
 from fspacker.packers.libspec.sci import PandasSpecPacker
 from fspacker.packers.libspec.sci import TorchSpecPacker
+from fspacker.settings import settings
 from fspacker.utils.libs import install_lib
+from fspacker.utils.libs import run_installs
 
 __all__ = [
     "LibraryPacker",
@@ -40,9 +51,36 @@ class LibraryPacker(BasePacker):
             torch=TorchSpecPacker(self),
         )
 
+    def outputs(self, target: PackTarget) -> typing.Set[pathlib.Path]:
+        # libs repo and resolved pins are shared by dist dirs, packed one at a time
+        return {target.packages_dir, settings.libs_dir}
+
     def pack(self, target: PackTarget):
-        for lib in set(target.libs):
-            install_lib(lib, target, extend_depends=True)
+        markers.skipped.clear()
+
+        # install in dependency order of the current environment
+        dist_names = {lib: canonicalize_name(distributions.lookup(lib) or lib) for lib in target.libs}
+        rank = {name: i for i, name in enumerate(LibraryAnalyzer.resolve_graph(dist_names.values()).order)}
+
+        # pin compatible versions from libs repo, download only what can't be satisfied locally
+        resolution = Resolver(libs_index.get_candidates(settings.libs_dir)).resolve(sorted(set(dist_names.values())))
+        with resources.lock:
+            resources.libs_repo.update(resolution.pins)
+            for name in resolution.unresolved:
+                resources.libs_repo.pop(name, None)
+
+        # submitted in dependency order, installed concurrently
+        run_installs(
+            functools.partial(
+                install_lib,
+                lib,
+                target,
+                extend_depends=True,
+                specifier=str(resolution.unresolved.get(dist_names[lib], "")),
+            )
+            for lib in sorted(target.libs, key=lambda x: (rank[dist_names[x]], x))
+        )
+        self._report_skipped(target)
 
         logging.info(f"After updating target ast tree: {target}")
         logging.info("Start packing with specs")
@@ -54,13 +92,31 @@ class LibraryPacker(BasePacker):
                 self.SPECS[k].pack(k, target=target)
 
         logging.info(f"Start packing [{target.libs}] with default")
+        installs = []
         for lib in list(target.libs):
-            lib = LibraryAnalyzer(lib).metadata.name
-            if lib in resources.libs_repo.keys():
-                self.SPECS["default"].pack(lib, target=target)
+            dist_name = distributions.lookup(lib)
+            if dist_name is not None and canonicalize_name(dist_name) in resources.libs_repo:
+                installs.append(functools.partial(self.SPECS["default"].pack, dist_name, target=target))
             else:
-                logging.error(f"[!!!] Lib [{lib}] for [{lib}] not found in repo")
-                if lib != "Unknown":
-                    install_lib(lib, target)
+                logging.error(f"[!!!] Lib [{dist_name}] for [{lib}] not found in repo")
+                if dist_name is not None:
+                    specifier = str(resolution.unresolved.get(canonicalize_name(dist_name), ""))
+                    installs.append(functools.partial(install_lib, dist_name, target, specifier=specifier))
                 else:
                     logging.error("lib unknown, skip.")
+        run_installs(installs)
+
+    @staticmethod
+    def _report_skipped(target: PackTarget) -> None:
+        """Report requirements pruned by markers, unless required by another library."""
+
+        packed = set(canonicalize_name(distributions.lookup(_) or _) for _ in target.libs)
+        skipped = {k: v for k, v in markers.skipped.items() if k not in packed}
+        if not skipped:
+            return
+
+        size = sum(resources.libs_repo[_].filepath.stat().st_size for _ in skipped if _ in resources.libs_repo)
+        logging.info(
+            f"Skipped [{len(skipped)}] packages unused on [{settings.target_platform}-{settings.python_ver}]: "
+            f"{sorted(skipped.values())}, [{size / 1024**2:.2f}]MB in libs repo"
+        )
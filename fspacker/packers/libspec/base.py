@@ -1,11 +1,15 @@
+import functools
 import logging
 import typing
 
+from packaging.utils import canonicalize_name
+
 from fspacker.core.archive import unpack
 from fspacker.core.resources import resources
 from fspacker.core.target import PackTarget
 from fspacker.packers.base import BasePacker
 from fspacker.utils.libs import install_lib
+from fspacker.utils.libs import run_installs
 
 
 class LibSpecPackerMixin:
@@ -28,26 +32,29 @@ class ChildLibSpecPacker(LibSpecPackerMixin):
         specs = {k: v for k, v in self.parent.SPECS.items() if k != lib}
 
         logging.info(f"Use [{self.__class__.__name__}] spec, {self.info}")
+        # child specs first, in this thread, then remaining libraries concurrently
+        installs = []
         if len(self.PATTERNS):
             for libname, patterns in self.PATTERNS.items():
                 if libname in specs:
                     specs[libname].pack(libname, target=target)
                 else:
-                    excludes = self.EXCLUDES.setdefault(libname, set())
-                    install_lib(libname, target, patterns, excludes)
+                    excludes = self.EXCLUDES.get(libname, set())
+                    installs.append(functools.partial(install_lib, libname, target, patterns, excludes))
         else:
-            excludes = self.EXCLUDES.setdefault(lib, set())
-            install_lib(lib, target, excludes=excludes)
+            excludes = self.EXCLUDES.get(lib, set())
+            installs.append(functools.partial(install_lib, lib, target, excludes=excludes))
+        run_installs(installs)
 
 
 class DefaultLibrarySpecPacker(LibSpecPackerMixin):
     def pack(self, lib: str, target: PackTarget):
         if lib not in target.lib_folders:
             logging.info(f"Packing [{lib}], using [default] lib spec")
-            info = resources.libs_repo.get(lib)
-            if info.filepath.suffix == ".whl":
+            info = resources.libs_repo.get(canonicalize_name(lib))
+            if info is not None and info.filepath.suffix == ".whl":
                 install_lib(lib, target)
-            elif info.filepath.suffix == ".gz":
+            elif info is not None and info.filepath.suffix == ".gz":
                 unpack(info.filepath, target.packages_dir)
             else:
                 logging.error(f"[!!!] Lib {lib} not found!")
@@ -1,11 +1,14 @@
 import logging
+import pathlib
 import shutil
 import ssl
 import time
 import urllib.request
 from typing import Optional
+from typing import Set
 from urllib.parse import urlparse
 
+from fspacker.core.cachemanager import cache_manager
 from fspacker.core.target import PackTarget
 from fspacker.packers.base import BasePacker
 from fspacker.settings import settings
@@ -58,6 +61,13 @@ class RuntimePacker(BasePacker):
         logging.info(f"Unpacking runtime: [{settings.embed_filepath.name}] -> [{dest.relative_to(target.root_dir)}]")
         shutil.unpack_archive(settings.embed_filepath, dest, "zip")
 
+    def inputs(self, target: PackTarget) -> Set[pathlib.Path]:
+        return {settings.embed_filepath}
+
+    def outputs(self, target: PackTarget) -> Set[pathlib.Path]:
+        # embed file in cache is shared by dist dirs, fetched one at a time
+        return {target.runtime_dir} if settings.offline_mode else {target.runtime_dir, settings.embed_filepath}
+
     @staticmethod
     def fetch_runtime() -> None:
         """Fetch runtime zip file from the fastest available mirror."""
@@ -67,6 +77,7 @@ class RuntimePacker(BasePacker):
             dst_checksum = calc_checksum(settings.embed_filepath)
             if src_checksum == dst_checksum:
                 logging.info("Checksum matches, using cached runtime")
+                cache_manager.touch(settings.embed_filepath, hit=True)
                 return
 
         fastest_url = get_fastest_embed_url()
@@ -93,3 +104,4 @@ class RuntimePacker(BasePacker):
         checksum = calc_checksum(settings.embed_filepath)
         logging.info(f"Updating checksum [{checksum}]")
         settings.config["file.embed.checksum"] = checksum
+        cache_manager.touch(settings.embed_filepath, hit=False)
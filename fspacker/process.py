@@ -1,12 +1,28 @@
+import functools
+import logging
+import os
 import pathlib
+import time
+import tracemalloc
 import typing
 
+from fspacker.core.cachemanager import cache_manager
+from fspacker.core.filesystem import filesystem
+from fspacker.core.parsecache import parse_cache
 from fspacker.core.parsers import parsers
+from fspacker.core.planner import plan_targets
+from fspacker.core.scheduler import Stage
+from fspacker.core.scheduler import StageScheduler
+from fspacker.core.target import Dependency
+from fspacker.core.target import PackTarget
+from fspacker.core.watcher import create_watcher
+from fspacker.core.wheelstore import wheel_store
 from fspacker.packers.base import BasePacker
 from fspacker.packers.depends import DependsPacker
 from fspacker.packers.entry import EntryPacker
 from fspacker.packers.library import LibraryPacker
 from fspacker.packers.runtime import RuntimePacker
+from fspacker.settings import settings
 
 
 class Processor:
@@ -14,9 +30,13 @@ class Processor:
         self,
         root_dir: pathlib.Path,
         file: typing.Optional[pathlib.Path] = None,
+        jobs: int = 1,
     ):
         self.root = root_dir
         self.file = file
+        self.jobs = jobs
+        # parsed dependencies of targets before packing, packers may extend them
+        self.parsed: typing.Dict[str, Dependency] = {}
         self.packers = dict(
             base=BasePacker(),
             depends=DependsPacker(),
@@ -29,20 +49,185 @@ class Processor:
     def _check_entry(entry: pathlib.Path) -> bool:
         return any(
             (
-                entry.is_dir(),
-                entry.is_file() and entry.suffix in ".py",
+                filesystem.is_dir(entry),
+                filesystem.is_file(entry) and entry.suffix in ".py",
             )
         )
 
-    def run(self):
+    def parse(self) -> None:
+        """Analysis phase, parse entries in root dir into pack targets.
+
+        In debug mode, peak memory of the phase is traced and reported.
+        """
+        trace_memory = logging.getLogger().isEnabledFor(logging.DEBUG) and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+
+        filesystem.clear()
         entries = sorted(
-            list(_ for _ in self.root.iterdir() if self._check_entry(_)),
-            key=lambda x: x.is_dir(),
+            list(_ for _ in filesystem.children(self.root) if self._check_entry(_)),
+            key=lambda x: filesystem.is_dir(x),
         )
 
+        parsers.RECORDS.clear()
+        if self.jobs != 1:
+            parsers.prescan(self.root, self.jobs)
+
         for entry in entries:
             parsers.parse(entry, root_dir=self.root)
 
-        for target in parsers.TARGETS.values():
-            for packer in self.packers.values():
-                packer.pack(target)
+        parse_cache.report()
+        parse_cache.save()
+        filesystem.report()
+
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            logging.debug(f"Analysis peak memory: [{peak / 1024**2:.2f}]MB")
+
+    @property
+    def workers(self) -> int:
+        return self.jobs or os.cpu_count() or 1
+
+    def run(self):
+        self.parse()
+
+        for name, target in parsers.TARGETS.items():
+            self.parsed[name] = target.depends.copy()
+        self.pack(list(parsers.TARGETS.values()))
+        wheel_store.report()
+
+        # keep repos under size cap, archives just used are evicted last
+        if settings.cache_auto_prune:
+            cache_manager.prune()
+        # usage of archives in this build, for LRU order and hit rate
+        cache_manager.save()
+
+    def pack(self, targets: typing.List[PackTarget]) -> None:
+        """Packing phase, run planned work units of targets as stages in a pool of `jobs` workers.
+
+        Units are ordered by the paths their packers read and write, see
+        `BasePacker.inputs` and `BasePacker.outputs`.
+        """
+        scheduler = StageScheduler(workers=self.workers)
+        for plan in plan_targets(targets):
+            for unit in plan.units:
+                packer = self.packers[unit.packer]
+                scheduler.add(
+                    Stage(
+                        name=unit.name,
+                        run=functools.partial(packer.pack, unit.target),
+                        inputs=packer.inputs(unit.target),
+                        outputs=packer.outputs(unit.target),
+                    )
+                )
+
+        scheduler.run()
+        scheduler.report()
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Keep watching root dir after packing, and update dist on changes."""
+
+        watcher = create_watcher(self.root)
+        try:
+            while True:
+                changes = watcher.wait(interval)
+                t0 = time.perf_counter()
+                self.update(changes)
+                logging.info(f"Update done! Total used: [{time.perf_counter() - t0:.2f}]s.")
+        except KeyboardInterrupt:
+            logging.info("Watching stopped.")
+        finally:
+            watcher.close()
+
+    def update(self, changes: typing.Set[pathlib.Path]) -> None:
+        """Re-run only the packing stages affected by changed files.
+
+        Targets importing a changed module are parsed again (unchanged files
+        come from the parse cache). Changed sources are copied one by one,
+        and only newly imported libraries are installed. Runtime and already
+        installed libraries are never touched.
+        """
+        filesystem.invalidate(changes)
+        for path in changes:
+            parsers.RECORDS.pop(path, None)
+
+        modules = set(_ for _ in changes if _.suffix == ".py")
+        for entry in sorted(_ for _ in modules if _.parent == self.root and _.stem not in parsers.TARGETS):
+            if entry.is_file():
+                self._parse(entry)
+
+        for name, target in list(parsers.TARGETS.items()):
+            if target.root_dir != self.root:
+                continue
+
+            if not target.src.is_file():
+                self._remove_target(name, target)
+                continue
+
+            if name not in self.parsed:
+                logging.info(f"New pack target: [{target.src.name}]")
+                self.parsed[name] = target.depends.copy()
+                self.pack([target])
+                continue
+
+            in_sources = set(_ for _ in changes if self._top_name(_) in target.sources)
+            touched = modules & (set(target.graph) | in_sources)
+            if not in_sources and not touched:
+                continue
+
+            if touched:
+                if not self._parse(target.src):
+                    continue
+                target = parsers.TARGETS[name]
+
+            self._update_target(name, target, changes)
+
+    def _parse(self, entry: pathlib.Path) -> bool:
+        """Parse entry again, a file failing to parse is skipped until next change.
+
+        Returns:
+            False if entry or one of its modules is half edited, removed or unreadable.
+        """
+        try:
+            parsers.parse(entry, root_dir=self.root)
+        except (SyntaxError, UnicodeDecodeError, OSError) as e:
+            logging.error(f"Parse [{entry.name}] failed, skipped: {e}")
+            return False
+        return True
+
+    def _remove_target(self, name: str, target: PackTarget) -> None:
+        """Drop target whose entry file was removed, with its `.exe`, `.int` and copied entry."""
+
+        logging.info(f"Entry removed, drop pack target: [{target.src.name}]")
+        parsers.TARGETS.pop(name, None)
+        self.parsed.pop(name, None)
+        for path in self.packers["entry"].outputs(target) | {target.dist_dir / "src" / target.src.name}:
+            if path.is_file():
+                path.unlink()
+
+    def _top_name(self, path: pathlib.Path) -> str:
+        """Import name of the top level source containing path."""
+        return pathlib.Path(path.relative_to(self.root).parts[0]).stem
+
+    def _update_target(self, name: str, target: PackTarget, changes: typing.Set[pathlib.Path]) -> None:
+        old, new = self.parsed[name], target.depends.copy()
+        self.parsed[name] = new
+
+        self.packers["depends"].update(target, changes)
+
+        partial = Dependency()
+        partial.sources = new.sources - old.sources
+        partial.libs = new.libs - old.libs
+        partial.extra = new.extra - old.extra
+        partial_target = PackTarget(src=target.src, depends=partial, graph=target.graph)
+        if partial.sources:
+            logging.info(f"New sources for [{target.src.name}]: {partial.sources}")
+            self.packers["depends"].pack(partial_target)
+
+        if target.src in changes or partial.libs or partial.extra:
+            self.packers["entry"].pack(target)
+
+        if partial.libs or partial.extra:
+            logging.info(f"New libraries for [{target.src.name}]: {partial.libs | partial.extra}")
+            self.packers["library"].pack(partial_target)
@@ -11,6 +11,8 @@ __all__ = [
 
 
 _config: typing.Dict[str, typing.Any] = {}
+# values given on command line, used for one run and never saved
+_overrides: typing.Dict[str, typing.Any] = {}
 
 
 def _get_cache_dir() -> pathlib.Path:
@@ -88,7 +90,7 @@ class Settings:
         "matplotlib",
         "tkinter",
     )
-    # mapping between import name and real file name
+    # mapping between import name and real file name, fallback for libs not installed locally
     libname_mapper = dict(
         pil="Pillow",
         docx="python-docx",
@@ -99,6 +101,22 @@ class Settings:
 
     # libs
     tkinter_libs = ("tkinter", "matplotlib")
+    # import kinds packed by default, optional and type-only imports are skipped
+    default_import_policy = ("hard", "platform")
+
+    # platform tag of wheels by machine of embed runtime
+    machine_platforms = dict(
+        amd64="win_amd64",
+        x86_64="win_amd64",
+        arm64="win_arm64",
+        aarch64="win_arm64",
+        x86="win32",
+        i386="win32",
+        i686="win32",
+    )
+
+    # concurrent writes before disk throughput stops scaling, on common SSDs
+    disk_io_parallelism = 8
 
     # tkinter
     tkinter_lib_path = assets_dir / "tkinter-lib.zip"
@@ -131,6 +149,14 @@ class Settings:
     def python_ver_short(self):
         return ".".join(self.python_ver.split(".")[:2])
 
+    @property
+    def target_platform(self):
+        """Platform tag of packed runtime, in [win_amd64, win32, win_arm64].
+
+        Follows machine of embed runtime, `target.platform` in config overrides it.
+        """
+        return self.config.get("target.platform", self.machine_platforms.get(self.machine, "win_amd64"))
+
     @property
     def machine(self):
         return platform.machine().lower()
@@ -155,14 +181,62 @@ class Settings:
     def embed_filepath(self):
         return self.embed_dir / self.embed_filename
 
+    @property
+    def library_jobs(self):
+        """Parallel library installs, config [library.jobs], available cores bounded by disk I/O parallelism if 0."""
+        jobs = self.config.get("library.jobs", 0)
+        if jobs:
+            return jobs
+
+        cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        return min(cores, self.disk_io_parallelism)
+
+    @property
+    def cache_max_size(self):
+        """Size cap of repos and wheel store in bytes, set in MB by config [cache.max_size]."""
+        return int(self.config.get("cache.max_size", 10240) * 1024**2)
+
+    @property
+    def cache_auto_prune(self):
+        """Prune caches after each build, off unless enabled by config [cache.auto_prune]."""
+        return bool(self.config.get("cache.auto_prune", False))
+
     @property
     def config(self):
         return _get_config()
 
+    @property
+    def overrides(self):
+        """Config values given on command line, not saved to `config.json`."""
+        return _overrides
+
+    def option(self, key: str, default: typing.Any = None) -> typing.Any:
+        """Value of config key, command line override first."""
+        return _overrides[key] if key in _overrides else self.config.get(key, default)
+
     @property
     def offline_mode(self):
         return self.config["mode.offline"]
 
+    @property
+    def parser_engine(self):
+        return self.option("parser.engine", "ast")
+
+    @property
+    def hidden_imports(self):
+        """Modules imported in ways the parser can't detect, declared by user."""
+        return self.option("parser.hidden_imports", [])
+
+    @property
+    def entries(self):
+        """Entry files declared by user, by file name or stem, detected from sources if empty."""
+        return self.option("parser.entries", [])
+
+    @property
+    def import_policy(self):
+        """Kinds of imports packed as libraries, in [hard, platform, optional, type-only]."""
+        return self.config.get("parser.import_policy", self.default_import_policy)
+
     @classmethod
     def save_config(cls):
         _save_config()
@@ -1,12 +1,16 @@
 import logging
 import pathlib
-import re
+import threading
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 import pkginfo
+from packaging.utils import canonicalize_name
 
 from fspacker.core.archive import unpack
+from fspacker.core.cachemanager import cache_manager
 from fspacker.core.libraryinfo import LibraryInfo
+from fspacker.core.markers import markers
 from fspacker.core.resources import resources
 from fspacker.core.target import PackTarget
 from fspacker.settings import settings
@@ -14,6 +18,34 @@ from fspacker.utils.trackers import perf_tracker
 from fspacker.utils.wheel import download_wheel
 from fspacker.utils.wheel import unpack_wheel
 
+# per library locks, a library required by several specs is installed once
+_lib_locks: typing.Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+# guards dependencies of targets extended by installs
+_depends_lock = threading.Lock()
+# downloads update libs repo index, one at a time
+_download_lock = threading.Lock()
+
+
+def _lib_lock(libname: str) -> threading.Lock:
+    with _locks_guard:
+        return _lib_locks.setdefault(canonicalize_name(libname), threading.Lock())
+
+
+def run_installs(tasks: typing.Iterable[typing.Callable[[], typing.Any]]) -> None:
+    """Run install tasks in a pool of `settings.library_jobs` workers, errors raise after all tasks finish."""
+
+    tasks = list(tasks)
+    if settings.library_jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            task()
+        return
+
+    with ThreadPoolExecutor(max_workers=settings.library_jobs) as executor:
+        futures = [executor.submit(_) for _ in tasks]
+    for future in futures:
+        future.result()
+
 
 def get_lib_meta_name(filepath: pathlib.Path) -> typing.Optional[str]:
     """
@@ -36,11 +68,13 @@ def get_lib_meta_name(filepath: pathlib.Path) -> typing.Optional[str]:
 
 
 def get_lib_meta_depends(filepath: pathlib.Path) -> typing.Set[str]:
-    """Get requires dist of lib file."""
+    """Get requires dist of lib file, active on target runtime, skipped ones are recorded in markers."""
     try:
         meta_data = pkginfo.get_metadata(str(filepath))
         if meta_data is not None and hasattr(meta_data, "requires_dist"):
-            dependencies = set(re.split(r"[;<>!=()\[~.]", x)[0].strip() for x in meta_data.requires_dist)
+            active, skipped = markers.split(meta_data.requires_dist)
+            markers.record(skipped)
+            dependencies = set(_.name for _ in active)
             logging.info(f"Dependencies for library [{filepath.name}]: {dependencies}")
             return dependencies
         else:
@@ -58,27 +92,44 @@ def install_lib(
     patterns: typing.Optional[typing.Set[str]] = None,
     excludes: typing.Optional[typing.Set[str]] = None,
     extend_depends: bool = False,
+    specifier: str = "",
+) -> bool:
+    with _lib_lock(libname):
+        return _install_lib(libname, target, patterns, excludes, extend_depends, specifier)
+
+
+def _install_lib(
+    libname: str,
+    target: PackTarget,
+    patterns: typing.Optional[typing.Set[str]],
+    excludes: typing.Optional[typing.Set[str]],
+    extend_depends: bool,
+    specifier: str,
 ) -> bool:
     lib_path = target.packages_dir / libname
     if lib_path.exists():
         logging.info("Lib file already exists, exit.")
         return False
 
-    info = resources.libs_repo.get(libname.lower())
+    info = resources.libs_repo.get(canonicalize_name(libname))
     if info is None or not info.filepath.exists():
         if settings.offline_mode:
             logging.error(f"[!!!] Offline mode, lib [{libname}] not found")
             return False
 
-        filepath = download_wheel(libname)
+        with _download_lock:
+            filepath = download_wheel(libname, specifier)
         if filepath and filepath.exists():
-            resources.libs_repo[libname] = LibraryInfo.from_filepath(filepath)
+            resources.add_library(canonicalize_name(libname), LibraryInfo.from_filepath(filepath))
             unpack(filepath, target.packages_dir)
     else:
         filepath = info.filepath
+        cache_manager.touch(filepath, hit=True)
         unpack_wheel(libname, target.packages_dir, patterns, excludes)
 
     if extend_depends and filepath and filepath.exists():
-        target.depends.libs |= get_lib_meta_depends(filepath)
+        depends = get_lib_meta_depends(filepath)
+        with _depends_lock:
+            target.depends.libs |= depends
 
     return True
@@ -0,0 +1,48 @@
+import fnmatch
+import functools
+import os
+import re
+import typing
+
+__all__ = ["PatternMatcher", "compile_matcher"]
+
+# same case sensitivity as `fnmatch.fnmatch` on the host
+_FLAGS = re.IGNORECASE if os.path.normcase("A") != "A" else 0
+
+
+def _combine(globs: typing.AbstractSet[str]) -> typing.Optional[typing.Pattern[str]]:
+    if not globs:
+        return None
+
+    return re.compile("|".join(fnmatch.translate(_) for _ in sorted(globs)), _FLAGS)
+
+
+class PatternMatcher:
+    """Include / exclude globs of a lib spec, each compiled into one regex.
+
+    A name is selected if it matches no exclude, and any pattern when
+    patterns are given, same as testing each glob with ``fnmatch.fnmatch``.
+    """
+
+    __slots__ = ("patterns", "excludes", "_include", "_exclude")
+
+    def __init__(self, patterns: typing.AbstractSet[str], excludes: typing.AbstractSet[str]):
+        self.patterns = frozenset(patterns)
+        self.excludes = frozenset(excludes)
+        self._include = _combine(self.patterns)
+        self._exclude = _combine(self.excludes)
+
+    def __call__(self, name: str) -> bool:
+        if self._exclude is not None and self._exclude.match(name):
+            return False
+        return self._include is None or self._include.match(name) is not None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(patterns={sorted(self.patterns)}, excludes={sorted(self.excludes)})"
+
+
+@functools.lru_cache(maxsize=None)
+def compile_matcher(patterns: typing.FrozenSet[str], excludes: typing.FrozenSet[str]) -> PatternMatcher:
+    """Matcher of globs, compiled once and shared by every spec with the same rules."""
+
+    return PatternMatcher(patterns, excludes)
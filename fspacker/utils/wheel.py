@@ -1,15 +1,19 @@
-import fnmatch
 import logging
 import pathlib
-import re
 import subprocess
 import typing
-import zipfile
 from urllib.parse import urlparse
 
-from fspacker.core.analyzers import LibraryAnalyzer
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+
+from fspacker.core.cachemanager import cache_manager
+from fspacker.core.distributions import distributions
+from fspacker.core.libsindex import libs_index
 from fspacker.core.resources import resources
+from fspacker.core.wheelstore import wheel_store
 from fspacker.settings import settings
+from fspacker.utils.matcher import compile_matcher
 from fspacker.utils.trackers import perf_tracker
 from fspacker.utils.url import get_fastest_pip_url
 
@@ -30,70 +34,86 @@ def unpack_wheel(
         logging.info(f"Lib [{libname}] already unpacked, skip")
         return
 
-    info = resources.libs_repo.get(libname)
+    info = resources.libs_repo.get(canonicalize_name(libname))
     if info is not None:
         logging.info(f"Unpacking by pattern [{info.meta_data.name}]->[{dest_dir.name}]")
 
-        # No rules, fast unpacking
-        # if not len(excludes) and not len(patterns):
-        #     shutil.unpack_archive(info.filepath, dest_dir, "zip")
-        #     return
-
-        excludes = set(excludes) | {"*dist-info/*"}
-        with zipfile.ZipFile(info.filepath, "r") as zip_ref:
-            for file in zip_ref.namelist():
-                if any(fnmatch.fnmatch(file, exclude) for exclude in excludes):
-                    continue
-
-                if len(patterns):
-                    if any(fnmatch.fnmatch(file, pattern) for pattern in patterns):
-                        zip_ref.extract(file, dest_dir)
-                        continue
-                    else:
-                        continue
-
-                zip_ref.extract(file, dest_dir)
+        matcher = compile_matcher(frozenset(patterns), frozenset(excludes) | {"*dist-info/*"})
+        count = wheel_store.install(info.filepath, dest_dir, matcher)
+        logging.info(f"Installed [{count}] files of [{info.meta_data.name}]")
     else:
         logging.error(f"[!!!] Lib {libname} wheel not found.")
 
 
+def _find_local_wheel(libname: str, specifier: str) -> typing.Optional[pathlib.Path]:
+    """Newest archive of lib in libs repo matching specifier."""
+
+    candidates = libs_index.get_candidates(settings.libs_dir).get(canonicalize_name(libname), [])
+    allowed = set(SpecifierSet(specifier).filter(str(_.meta_data.version) for _ in candidates))
+    return next((_.filepath for _ in candidates if _.meta_data.version in allowed), None)
+
+
 @perf_tracker
-def download_wheel(libname: str) -> typing.Optional[pathlib.Path]:
-    """Download wheel file for lib name, if not found in lib repo."""
-    libname = LibraryAnalyzer(libname).metadata.name
-    match_name = "*".join(re.split(r"[-_]", libname))
-    lib_files = list(_ for _ in settings.libs_dir.rglob(f"{match_name}*"))
-
-    if not lib_files:
-        logging.warning(f"No wheel for [{libname}], start downloading.")
+def download_wheel(libname: str, specifier: str = "") -> typing.Optional[pathlib.Path]:
+    """Download wheel file for lib name, if no version matching specifier found in lib repo.
+
+    Wheels are downloaded for the tags of embed runtime, packages without such
+    a wheel fall back to their sdist, e.g. pure python packages publishing no wheel.
+    """
+    libname = distributions.lookup(libname) or libname
+    requirement = f"{libname}{specifier}"
+    lib_file = _find_local_wheel(libname, specifier)
+
+    if lib_file is None:
+        logging.warning(f"No wheel for [{requirement}], start downloading.")
         pip_url = get_fastest_pip_url()
         net_loc = urlparse(pip_url).netloc
 
+        command = [
+            "python",
+            "-m",
+            "pip",
+            "download",
+            requirement,
+            "-d",
+            str(settings.libs_dir),
+            "--trusted-host",
+            net_loc,
+            "-i",
+            pip_url,
+        ]
         try:
+            # wheels for embed runtime, not for host
             subprocess.check_call(
                 [
-                    "python",
-                    "-m",
-                    "pip",
-                    "download",
-                    libname,
-                    "-d",
-                    str(settings.libs_dir),
-                    "--trusted-host",
-                    net_loc,
-                    "-i",
-                    pip_url,
+                    *command,
+                    "--platform",
+                    settings.target_platform,
+                    "--python-version",
+                    settings.python_ver_short,
+                    "--implementation",
+                    "cp",
+                    "--only-binary=:all:",
                 ],
             )
         except subprocess.CalledProcessError as e:
-            logging.error(f"Failed to download wheel [{libname}]: {e}")
-            return None
-
-        lib_files = list(_ for _ in settings.libs_dir.rglob(f"{match_name}*"))
+            logging.warning(f"No wheel of [{requirement}] for [{settings.target_platform}], try sdist: {e}")
+            try:
+                # pure python packages publishing only sdist, requirements are resolved by packer
+                subprocess.check_call([*command, "--no-binary=:all:", "--no-deps"])
+            except subprocess.CalledProcessError as e:
+                logging.error(f"Failed to download wheel [{requirement}]: {e}")
+                return None
+
+        lib_file = _find_local_wheel(libname, specifier)
+        if lib_file is not None:
+            cache_manager.touch(lib_file, hit=False)
+    else:
+        cache_manager.touch(lib_file, hit=True)
 
-    if not len(lib_files):
-        logging.error(f"[!!!] Download wheel [{libname}] error, {match_name=}")
+    if lib_file is None:
+        logging.error(f"[!!!] Download wheel [{requirement}] error")
         return None
 
-    logging.info(f"Successfully downloaded wheel [{libname}] to [{lib_files[0]}]")
-    return lib_files[0]
+    logging.info(f"Successfully downloaded wheel [{requirement}] to [{lib_file}]")
+    return lib_file
@@ -1,12 +1,22 @@
+import email.message
+import email.parser
 import logging
 import pathlib
+import tarfile
 import typing
 
+import packaging.utils
+import packaging.version
+
 
 def get_zip_meta_data(filepath: pathlib.Path) -> typing.Tuple[str, str]:
     if filepath.suffix == ".whl":
-        name, version, *_ = filepath.name.split("-")
-        name = name.replace("_", "-")
+        try:
+            parsed_name, parsed_version, *_ = packaging.utils.parse_wheel_filename(filepath.name)
+            name, version = str(parsed_name), str(parsed_version)
+        except (packaging.utils.InvalidWheelFilename, packaging.version.InvalidVersion):
+            name, version, *_ = filepath.name.split("-")
+            name = name.replace("_", "-")
     elif filepath.suffix == ".gz":
         name, version = filepath.name.rsplit("-", 1)
     else:
@@ -14,3 +24,24 @@ def get_zip_meta_data(filepath: pathlib.Path) -> typing.Tuple[str, str]:
         name, version = "", ""
 
     return name.lower(), version.lower()
+
+
+def read_sdist_metadata(filepath: pathlib.Path) -> typing.Optional[email.message.Message]:
+    """Read metadata of sdist, streaming members until the first `<name>-<ver>/PKG-INFO`.
+
+    The archive is never indexed as a whole, members after metadata are not decompressed.
+    """
+    try:
+        with tarfile.open(filepath, mode="r|*") as tar:
+            for member in tar:
+                parts = member.name.strip("/").split("/")
+                if not member.isfile() or parts[-1] not in ("PKG-INFO", "METADATA") or len(parts) > 2:
+                    continue
+
+                f = tar.extractfile(member)
+                if f is not None:
+                    return email.parser.BytesParser().parsebytes(f.read())
+    except (OSError, tarfile.TarError) as e:
+        logging.error(f"Error reading sdist metadata from [{filepath.name}]: {e}")
+
+    return None
@@ -1,10 +1,14 @@
+import fnmatch
+import io
 import logging
 import os
 import pathlib
 import shutil
 import subprocess
+import tarfile
 import time
 import typing
+import zipfile
 
 import pytest
 
@@ -101,6 +105,72 @@ def run_proc():
     return runner
 
 
+def _metadata(name: str, version: str, requires: typing.Iterable[str]) -> str:
+    return "\n".join(
+        ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}", *[f"Requires-Dist: {_}" for _ in requires]]
+    )
+
+
+@pytest.fixture(scope="session")
+def create_wheel():
+    """Create wheel file, with metadata if name is given and extra members by name."""
+
+    def factory(
+        filepath: pathlib.Path,
+        name: str = "",
+        version: str = "",
+        requires: typing.Iterable[str] = (),
+        members: typing.Optional[typing.Dict[str, typing.Union[str, bytes]]] = None,
+    ) -> pathlib.Path:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(filepath, "w") as whl:
+            if name:
+                whl.writestr(f"{name}-{version}.dist-info/METADATA", _metadata(name, version, requires))
+            for arcname, content in (members or {}).items():
+                whl.writestr(arcname, content)
+        return filepath
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def create_sdist():
+    """Create sdist file with metadata, a misleading egg-info and a payload member."""
+
+    def factory(
+        filepath: pathlib.Path,
+        name: str,
+        version: str,
+        requires: typing.Iterable[str] = (),
+        payload: bytes = b"",
+    ) -> pathlib.Path:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with tarfile.open(filepath, "w:gz") as tar:
+            for arcname, content in (
+                (f"{name}-{version}/PKG-INFO", _metadata(name, version, requires).encode()),
+                (f"{name}-{version}/src/{name}.egg-info/PKG-INFO", b"Name: wrong\n"),
+                (f"{name}-{version}/src/{name}/data.bin", payload),
+            ):
+                info = tarfile.TarInfo(arcname)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        return filepath
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def fnmatch_selected():
+    """Former loop of `unpack_wheel`, testing each glob with `fnmatch`."""
+
+    def selected(name: str, patterns: typing.AbstractSet[str], excludes: typing.AbstractSet[str]) -> bool:
+        if any(fnmatch.fnmatch(name, exclude) for exclude in excludes):
+            return False
+        return not len(patterns) or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+    return selected
+
+
 @pytest.fixture
 def dir_examples():
     return DIR_EXAMPLES
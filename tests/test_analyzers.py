@@ -15,6 +15,15 @@ from fspacker.core.analyzers import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_requires():
+    """Requirements are memoized across analyzers, don't leak mocks between tests."""
+
+    LibraryAnalyzer.REQUIRES.clear()
+    yield
+    LibraryAnalyzer.REQUIRES.clear()
+
+
 @pytest.fixture()
 def mock_distribution(mocker):
     """Create a mock distribution object."""
@@ -181,6 +190,40 @@ def test_export_dependency_tree(
     assert exported_tree == dependency_tree
 
 
+def test_resolve_graph(mocker):
+    """Test resolving transitive dependencies, each distribution read once."""
+
+    requires = {
+        "app": ["Lib-A >=1.0", "lib_b", "pytest; extra == 'test'"],
+        "lib-a": ["lib-c"],
+        "lib-b": ["lib-c", "missing"],
+        "lib-c": ["app"],
+    }
+
+    def distribution(name):
+        if name not in requires:
+            raise PackageNotFoundError(name)
+        dist = mocker.MagicMock()
+        dist.requires = requires[name]
+        return dist
+
+    mock = mocker.patch("importlib.metadata.distribution", side_effect=distribution)
+    graph = LibraryAnalyzer.resolve_graph(["app"])
+
+    assert graph.adjacency == {
+        "app": ["lib-a", "lib-b"],
+        "lib-a": ["lib-c"],
+        "lib-b": ["lib-c", "missing"],
+        "lib-c": ["app"],
+        "missing": [],
+    }
+    assert graph.order == ["lib-c", "lib-a", "missing", "lib-b", "app"]
+    assert mock.call_count == 5
+
+    assert LibraryAnalyzer.resolve_graph(["lib_b"], depth=0).adjacency == {"lib-b": ["lib-c", "missing"]}
+    assert mock.call_count == 5
+
+
 def create_mock_whl_file(dependencies):
     """Create a mock .whl file containing specified dependency information."""
 
@@ -0,0 +1,110 @@
+import email.parser
+import os
+import pathlib
+import tarfile
+import typing
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(params=["resources_rc", "typing"])
+def scan_source_file(request, gui_pyside2):
+    """Generated module full of byte literals, and a large hand-written module."""
+
+    if request.param == "resources_rc":
+        filepath = gui_pyside2 / "resources_rc.py"
+    else:
+        filepath = pathlib.Path(typing.__file__)
+    return filepath, filepath.read_text(encoding="utf-8")
+
+
+@pytest.mark.benchmark(group="scanners")
+@pytest.mark.parametrize("engine", ["ast", "scan"])
+def test_bench_scanners(benchmark, scan_source_file, engine):
+    from fspacker.core.scanners import scan_content
+
+    filepath, content = scan_source_file
+    record = benchmark(scan_content, content, filepath, engine)
+
+    assert record == scan_content(content, filepath)
+    benchmark.extra_info["MB/s"] = len(content.encode()) / 1024**2 / benchmark.stats.stats.mean
+
+
+@pytest.fixture(scope="module")
+def large_sdist(tmp_path_factory, create_sdist):
+    filepath = tmp_path_factory.mktemp("sdist") / "big-1.0.tar.gz"
+    create_sdist(filepath, "big", "1.0", ["numpy>=1.20"], payload=os.urandom(32 * 1024**2))
+    return filepath
+
+
+def _read_sdist_members(filepath):
+    """Former approach, index all members before looking for metadata."""
+
+    with tarfile.open(filepath) as tar:
+        member = next(_ for _ in tar.getmembers() if _.name.endswith("/PKG-INFO"))
+        return email.parser.BytesParser().parsebytes(tar.extractfile(member).read())
+
+
+@pytest.mark.benchmark(group="sdist")
+@pytest.mark.parametrize("reader", ["stream", "members"])
+def test_bench_sdist_metadata(benchmark, large_sdist, reader):
+    from fspacker.utils.zip import read_sdist_metadata
+
+    func = read_sdist_metadata if reader == "stream" else _read_sdist_members
+    message = benchmark(func, large_sdist)
+    assert message.get_all("Requires-Dist") == ["numpy>=1.20"]
+
+
+@pytest.fixture(scope="module")
+def torch_members():
+    """Member names shaped like a torch wheel."""
+
+    dirs = ["torch/nn", "torch/utils/data/dataset", "torch/utils/tensorboard", "torch/lib", "torch/_C", "caffe2/python"]
+    return [f"{dirs[i % len(dirs)]}/module_{i}.py" for i in range(20000)] + ["torch-2.0.dist-info/RECORD"]
+
+
+@pytest.mark.benchmark(group="matcher")
+@pytest.mark.parametrize("matcher", ["compiled", "fnmatch"])
+def test_bench_matcher(benchmark, torch_members, matcher, fnmatch_selected):
+    from fspacker.packers.libspec.sci import TorchSpecPacker
+    from fspacker.utils.matcher import compile_matcher
+
+    excludes = TorchSpecPacker.EXCLUDES["torch"] | {"*dist-info/*"}
+    if matcher == "compiled":
+        compiled = compile_matcher(frozenset(), frozenset(excludes))
+        selected = benchmark(lambda: [_ for _ in torch_members if compiled(_)])
+    else:
+        selected = benchmark(lambda: [_ for _ in torch_members if fnmatch_selected(_, set(), excludes)])
+    # tensorboard and dataset members, and metadata excluded
+    assert len(selected) == 13333
+
+
+@pytest.fixture(scope="module")
+def large_wheel(tmp_path_factory, create_wheel):
+    members = {f"big/sub{i % 16}/mod{i}.bin": os.urandom(256 * 1024) for i in range(256)}
+    return create_wheel(tmp_path_factory.mktemp("wheel") / "big-1.0-py3-none-any.whl", members=members)
+
+
+def _extract_members(filepath, dest_dir):
+    """Former approach, one `extract` per member name."""
+
+    import zipfile
+
+    with zipfile.ZipFile(filepath, "r") as zip_ref:
+        for file in zip_ref.namelist():
+            zip_ref.extract(file, dest_dir)
+
+
+@pytest.mark.benchmark(group="extract")
+@pytest.mark.parametrize("engine", ["store", "members"])
+def test_bench_extract_wheel(benchmark, large_wheel, tmp_path, monkeypatch, engine):
+    from fspacker.core.wheelstore import WheelStore
+
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    if engine == "store":
+        benchmark(lambda: WheelStore().extract(large_wheel))
+    else:
+        benchmark(_extract_members, large_wheel, tmp_path / "dest")
+    benchmark.extra_info["MB/s"] = 64 / benchmark.stats.stats.mean
@@ -0,0 +1,133 @@
+import os
+
+from click.testing import CliRunner
+
+from fspacker.cli import cli
+from fspacker.core.cachemanager import CacheManager
+from fspacker.core.wheelstore import wheel_store
+from fspacker.settings import settings
+
+
+def _create_archive(filepath, size, mtime):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_bytes(b"0" * size)
+    os.utime(filepath, (mtime, mtime))
+    return filepath
+
+
+def test_cache_manager_prune(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    monkeypatch.delenv("FSPACKER_LIBS", raising=False)
+
+    oldest = _create_archive(tmp_path / "libs-repo" / "a-1.0-py3-none-any.whl", 100, 1000)
+    pinned = _create_archive(tmp_path / "libs-repo" / "b-1.0-py3-none-any.whl", 100, 2000)
+    used = _create_archive(tmp_path / "libs-repo" / "c-1.0.tar.gz", 100, 3000)
+    embed = _create_archive(tmp_path / "embed-repo" / "python-3.8.10-embed-amd64.zip", 100, 4000)
+    (tmp_path / "cache.lock").write_text("# pinned archives\nb-*.whl\n", encoding="utf-8")
+
+    manager = CacheManager()
+    manager.touch(embed, hit=True)
+    manager.touch(used, hit=False)
+    stats = manager.stats()
+    assert stats["repos"] == dict(
+        libs=dict(files=3, bytes=300),
+        embed=dict(files=1, bytes=100),
+        store=dict(files=0, bytes=0),
+    )
+    assert stats["hit_rate"] == 0.5
+
+    assert manager.prune(350, dry_run=True) == (1, 100)
+    assert oldest.exists()
+
+    # never used archives by mtime first, pinned is skipped, then least recently used
+    assert manager.prune(250) == (2, 200)
+    assert not oldest.exists() and not embed.exists()
+    assert pinned.exists() and used.exists()
+    assert not list(tmp_path.rglob("*.evicting"))
+
+    manager = CacheManager()
+    manager.load()
+    assert (manager.hits, manager.misses) == (1, 1)
+    assert list(manager.usage) == [os.path.abspath(used)]
+
+
+def test_cache_manager_wheel_store(tmp_path, monkeypatch, create_wheel):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    monkeypatch.delenv("FSPACKER_LIBS", raising=False)
+
+    wheels = []
+    for name, mtime in (("a", 1000), ("b", 2000)):
+        wheel = create_wheel(
+            tmp_path / "libs-repo" / f"{name}-1.0-py3-none-any.whl",
+            members={f"{name}/core.py": name * 1000, "shared.py": "x" * 500},
+        )
+        os.utime(wheel, (mtime, mtime))
+        wheel_store.install(wheel, tmp_path / "dist", lambda x: True)
+        wheels.append(wheel)
+
+    manager = CacheManager()
+    stats = manager.stats()
+    assert stats["repos"]["store"] == dict(files=3, bytes=2500)
+    assert stats["total"] == 2500 + sum(_.stat().st_size for _ in wheels)
+
+    # objects only referred to by evicted wheel are reclaimed with it
+    size = wheels[0].stat().st_size
+    assert manager.prune(stats["total"] - 1) == (1, size + 1000)
+    assert not wheels[0].exists() and wheels[1].exists()
+    assert manager.stats()["repos"]["store"] == dict(files=2, bytes=1500)
+
+
+def test_cache_manager_shared_libs(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setenv("FSPACKER_LIBS", str(tmp_path / "shared"))
+    shared = _create_archive(tmp_path / "shared" / "a-1.0-py3-none-any.whl", 100, 1000)
+    embed = _create_archive(tmp_path / "cache" / "embed-repo" / "python-3.8.10-embed-amd64.zip", 100, 2000)
+
+    manager = CacheManager()
+    assert "libs" not in manager.stats()["repos"]
+    assert manager.prune(0) == (1, 100)
+    assert shared.exists() and not embed.exists()
+
+
+def test_cache_auto_prune(tmp_path, monkeypatch, mocker):
+    from fspacker.process import Processor
+
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    monkeypatch.delenv("FSPACKER_LIBS", raising=False)
+    manager = CacheManager()
+    monkeypatch.setattr("fspacker.process.cache_manager", manager)
+    archive = _create_archive(tmp_path / "libs-repo" / "a-1.0-py3-none-any.whl", 100, 1000)
+
+    processor = Processor(tmp_path)
+    mocker.patch.object(processor, "parse")
+    mocker.patch.object(processor, "pack", side_effect=lambda _: manager.touch(archive, hit=True))
+    prune = mocker.spy(manager, "prune")
+
+    # usage of build is saved without pruning
+    monkeypatch.delitem(settings.config, "cache.auto_prune", raising=False)
+    processor.run()
+    prune.assert_not_called()
+    saved = CacheManager()
+    saved.load()
+    assert (saved.hits, list(saved.usage)) == (1, [os.path.abspath(archive)])
+
+    monkeypatch.setitem(settings.config, "cache.auto_prune", True)
+    processor.run()
+    prune.assert_called_once()
+
+
+def test_cache_commands(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    monkeypatch.delenv("FSPACKER_LIBS", raising=False)
+    _create_archive(tmp_path / "libs-repo" / "a-1.0-py3-none-any.whl", 1024**2, 1000)
+    monkeypatch.setattr(CacheManager, "_instance", None)
+    monkeypatch.setattr("fspacker.core.cachemanager.cache_manager", CacheManager.get_instance())
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["cache", "stats"])
+    assert result.exit_code == 0
+    assert "libs: 1 files, 1.00MB" in result.output
+
+    result = runner.invoke(cli, ["c", "p", "--max-size", "0"])
+    assert result.exit_code == 0
+    assert "1 archives evicted, 1.00MB reclaimed" in result.output
@@ -45,3 +45,39 @@ def test_config():
     settings.config["mode.offline"] = False
     assert settings.config.get("mode.not_exist", None) is None
     assert settings.config.get("mode.debug", None) is None
+
+
+def test_target_platform(monkeypatch):
+    from fspacker.settings import settings
+
+    monkeypatch.delitem(settings.config, "target.platform", raising=False)
+    for machine, tag in (("amd64", "win_amd64"), ("arm64", "win_arm64"), ("x86", "win32")):
+        monkeypatch.setattr("platform.machine", lambda m=machine: m.upper())
+        assert settings.embed_filename.endswith(f"-{machine}.zip")
+        assert settings.target_platform == tag
+
+    monkeypatch.setitem(settings.config, "target.platform", "win32")
+    assert settings.target_platform == "win32"
+
+
+def test_cli_overrides_not_saved(monkeypatch, mocker):
+    from click.testing import CliRunner
+
+    from fspacker.cli import cli
+    from fspacker.settings import settings
+
+    mocker.patch("fspacker.process.Processor")
+    config = {"parser.engine": "scan", "parser.entries": ["app.py"], "parser.hidden_imports": ["toml"]}
+    monkeypatch.setattr("fspacker.settings._config", config)
+    monkeypatch.setattr("fspacker.settings._overrides", {})
+
+    assert CliRunner().invoke(cli, ["build"]).exit_code == 0
+    assert (settings.parser_engine, settings.entries, settings.hidden_imports) == ("scan", ["app.py"], ["toml"])
+
+    assert CliRunner().invoke(cli, ["build", "-e", "ast", "-E", "tool.py", "-H", "yaml"]).exit_code == 0
+    assert (settings.parser_engine, settings.entries, settings.hidden_imports) == ("ast", ["tool.py"], ["yaml"])
+    assert {k: config[k] for k in ("parser.engine", "parser.entries", "parser.hidden_imports")} == {
+        "parser.engine": "scan",
+        "parser.entries": ["app.py"],
+        "parser.hidden_imports": ["toml"],
+    }
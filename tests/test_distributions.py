@@ -0,0 +1,30 @@
+import importlib.metadata
+
+from fspacker.core.distributions import DistributionIndex
+
+
+def test_distribution_index(tmp_path, monkeypatch, mocker):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+
+    index = DistributionIndex()
+    # from top_level.txt
+    assert index.lookup("_pytest") == "pytest"
+    assert index.lookup("pytest_mock.plugin") == "pytest-mock"
+    # from RECORD, packaging has no top_level.txt
+    assert index.lookup("packaging") == "packaging"
+    # distribution names of requirements, import name differs
+    assert index.lookup("pytest-mock") == "pytest-mock"
+    # not installed, from mapper
+    assert index.lookup("docx") == "python-docx"
+    assert index.lookup("not_installed_lib") is None
+    assert index.filepath.exists()
+
+    spy = mocker.spy(importlib.metadata, "distributions")
+    index = DistributionIndex()
+    assert index.lookup("_pytest") == "pytest"
+    assert spy.call_count == 0
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    index = DistributionIndex()
+    assert index.lookup("_pytest") == "pytest"
+    assert spy.call_count == 1
@@ -0,0 +1,41 @@
+from fspacker.core.filesystem import FileSystemSnapshot
+
+
+def test_filesystem_snapshot(tmp_path):
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "module_e.py").write_text("")
+    (tmp_path / "module_a.py").write_text("")
+    (tmp_path / "assets").mkdir()
+
+    snapshot = FileSystemSnapshot()
+    assert snapshot.resolve_import(tmp_path, "core") == tmp_path / "core"
+    assert snapshot.resolve_import(tmp_path, "core.module_e") == tmp_path / "core" / "module_e.py"
+    assert snapshot.resolve_import(tmp_path, "module_a") == tmp_path / "module_a.py"
+    assert snapshot.resolve_import(tmp_path, "yaml") is None
+    assert snapshot.resolve_import(tmp_path, "core.missing.module") is None
+    assert snapshot.find(tmp_path, "module_a") == tmp_path / "module_a.py"
+    assert snapshot.find(tmp_path, "assets") == tmp_path / "assets"
+    assert snapshot.is_dir(tmp_path / "assets")
+    assert not snapshot.is_file(tmp_path / "assets")
+
+    # root, core and core/missing listed once each, everything else from memory
+    assert snapshot.scans == 3
+    assert snapshot.syscalls_saved == snapshot.lookups - 3
+
+    (tmp_path / "module_b.py").write_text("")
+    assert snapshot.resolve_import(tmp_path, "module_b") is None
+    snapshot.invalidate([tmp_path / "module_b.py"])
+    assert snapshot.resolve_import(tmp_path, "module_b") == tmp_path / "module_b.py"
+
+
+def test_filesystem_walk(tmp_path):
+    (tmp_path / "pkg" / "__pycache__").mkdir(parents=True)
+    (tmp_path / "pkg" / "__pycache__" / "a.py").write_text("")
+    (tmp_path / "pkg" / "a.py").write_text("")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "b.py").write_text("")
+    (tmp_path / "main.py").write_text("")
+
+    snapshot = FileSystemSnapshot()
+    files = list(snapshot.walk(tmp_path, lambda name: name.startswith(".") or name == "__pycache__"))
+    assert files == [tmp_path / "main.py", tmp_path / "pkg" / "a.py"]
@@ -0,0 +1,43 @@
+import pathlib
+import threading
+import time
+
+from fspacker.core.target import Dependency
+from fspacker.core.target import PackTarget
+from fspacker.settings import settings
+from fspacker.utils import libs
+
+
+def test_install_libs_concurrently(mocker, monkeypatch):
+    monkeypatch.setitem(settings.config, "library.jobs", 4)
+    active = {}
+    peak = []
+    lock = threading.Lock()
+
+    def _install_lib(libname, target, *args):
+        libname = libname.lower()
+        with lock:
+            active[libname] = active.get(libname, 0) + 1
+            peak.append((libname, active[libname], sum(active.values())))
+        time.sleep(0.05)
+        with lock:
+            active[libname] -= 1
+        return True
+
+    mocker.patch.object(libs, "_install_lib", side_effect=_install_lib)
+    target = PackTarget(src=pathlib.Path("/proj/main.py"), depends=Dependency())
+    names = ["numpy", "NumPy", "pandas", "six", "pyyaml"]
+    libs.run_installs(lambda name=name: libs.install_lib(name, target) for name in names)
+
+    # one install per library at a time, several libraries at once
+    assert max(_[1] for _ in peak) == 1
+    assert max(_[2] for _ in peak) > 1
+    assert len(peak) == len(names)
+
+
+def test_library_jobs(monkeypatch):
+    monkeypatch.setitem(settings.config, "library.jobs", 0)
+    assert 1 <= settings.library_jobs <= settings.disk_io_parallelism
+
+    monkeypatch.setitem(settings.config, "library.jobs", 3)
+    assert settings.library_jobs == 3
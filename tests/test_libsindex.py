@@ -0,0 +1,73 @@
+import os
+
+from fspacker.core.libsindex import LibraryIndex
+
+
+def test_libs_index(tmp_path, monkeypatch, create_wheel):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    libs_dir = tmp_path / "libs-repo"
+    create_wheel(libs_dir / "PyYAML-6.0-py3-none-any.whl", "PyYAML", "6.0")
+    create_wheel(libs_dir / "old" / "PyYAML-5.4-py3-none-any.whl", "PyYAML", "5.4")
+    create_wheel(libs_dir / "sub" / "requests-2.31.0-py3-none-any.whl", "requests", "2.31.0", ["idna<4,>=2.5"])
+    (libs_dir / "broken-1.0-py3-none-any.whl").write_bytes(b"not a zip")
+
+    index = LibraryIndex()
+    repo = index.get_repo(libs_dir)
+    assert set(repo) == {"pyyaml", "requests"}
+    assert repo["pyyaml"].meta_data.version == "6.0"
+    assert repo["requests"].filepath == libs_dir / "sub" / "requests-2.31.0-py3-none-any.whl"
+    assert repo["requests"].meta_data.requires_dist == ("idna<4,>=2.5",)
+    assert index.reads == 4
+
+    index = LibraryIndex()
+    assert index.get_repo(libs_dir).keys() == repo.keys()
+    assert index.reads == 0
+
+    wheel = libs_dir / "sub" / "requests-2.31.0-py3-none-any.whl"
+    create_wheel(wheel, "requests", "2.31.0", ["idna<4,>=2.5", "certifi>=2017.4.17"])
+    os.utime(wheel, ns=(0, os.stat(wheel).st_mtime_ns + 10**9))
+    (libs_dir / "old" / "PyYAML-5.4-py3-none-any.whl").unlink()
+    repo = index.get_repo(libs_dir)
+    assert repo["requests"].meta_data.requires_dist == ("idna<4,>=2.5", "certifi>=2017.4.17")
+    assert index.reads == 1
+    assert len(index.entries) == 3
+
+
+def test_libs_index_sdist(tmp_path, monkeypatch, create_sdist):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    libs_dir = tmp_path / "libs-repo"
+    create_sdist(libs_dir / "docopt-0.6.2.tar.gz", "docopt", "0.6.2", ["colorama; sys_platform == 'win32'"])
+
+    repo = LibraryIndex().get_repo(libs_dir)
+    assert repo["docopt"].meta_data.version == "0.6.2"
+    assert repo["docopt"].meta_data.requires_dist == ("colorama; sys_platform == 'win32'",)
+
+
+def test_libs_index_wheel_tags(tmp_path, monkeypatch, create_wheel):
+    from fspacker.core.libsindex import ranked_tags
+    from fspacker.settings import Settings
+
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    monkeypatch.setattr(Settings, "python_ver_short", property(lambda self: "3.8"))
+    libs_dir = tmp_path / "libs-repo"
+    for filename in (
+        "numpy-1.24.4-cp38-cp38-win_amd64.whl",
+        "numpy-1.24.4-cp38-cp38-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+        "numpy-1.26.4-cp311-cp311-win_amd64.whl",
+        "six-1.16.0-py2.py3-none-any.whl",
+        "six-1.16.0-cp38-abi3-win_amd64.whl",
+    ):
+        name, version, *_ = filename.split("-")
+        create_wheel(libs_dir / filename, name, version)
+
+    index = LibraryIndex()
+    candidates = index.get_candidates(libs_dir)
+    assert [_.filepath.name for _ in candidates["numpy"]] == ["numpy-1.24.4-cp38-cp38-win_amd64.whl"]
+    assert [_.filepath.name for _ in candidates["six"]] == ["six-1.16.0-cp38-abi3-win_amd64.whl"]
+    assert index.lookup("six", "1.16.0", "py3-none-any") == libs_dir / "six-1.16.0-py2.py3-none-any.whl"
+    assert index.lookup("numpy", "1.26.4", "cp311-cp311-win_amd64") is None
+
+    tags = ranked_tags("3.8", "win_amd64")
+    assert tags["cp38-cp38-win_amd64"] < tags["cp38-abi3-win_amd64"] < tags["py3-none-any"]
+    assert "cp38-cp38-manylinux2014_x86_64" not in tags
+    assert ranked_tags("3.8", "win_amd64") is tags
@@ -0,0 +1,39 @@
+from fspacker.core.markers import markers
+from fspacker.settings import settings
+from fspacker.utils.libs import get_lib_meta_depends
+
+
+def test_markers_target_environment(monkeypatch):
+    requires = [
+        "colorama; sys_platform == 'win32'",
+        "uvloop; sys_platform != 'win32' and platform_python_implementation == 'CPython'",
+        "pytest>=7; extra == 'test'",
+        "backports.zoneinfo; python_version < '3.0'",
+        "pywin32-ctypes; platform_machine == 'x86'",
+        "idna",
+        "not a requirement !",
+    ]
+    active, skipped = markers.split(requires)
+    assert [_.name for _ in active] == ["colorama", "idna"]
+    assert [_.name for _ in skipped] == ["uvloop", "pytest", "backports.zoneinfo", "pywin32-ctypes"]
+
+    active, _ = markers.split(requires, extras=["test"])
+    assert [_.name for _ in active] == ["colorama", "pytest", "idna"]
+
+    monkeypatch.setitem(settings.config, "target.platform", "win32")
+    active, _ = markers.split(requires)
+    assert [_.name for _ in active] == ["colorama", "pywin32-ctypes", "idna"]
+
+
+def test_lib_meta_depends_pruned(tmp_path, create_wheel):
+    wheel = tmp_path / "requests-2.31.0-py3-none-any.whl"
+    create_wheel(
+        wheel,
+        "requests",
+        "2.31.0",
+        ["idna<4,>=2.5", "PySocks!=1.5.7,>=1.5.6; extra == 'socks'", "chardet<6,>=3.0.2; extra == 'use_chardet'"],
+    )
+
+    markers.skipped.clear()
+    assert get_lib_meta_depends(wheel) == {"idna"}
+    assert set(markers.skipped) == {"pysocks", "chardet"}
@@ -0,0 +1,30 @@
+from fspacker.packers.libspec.gui import PySide2Packer
+from fspacker.packers.libspec.sci import TorchSpecPacker
+from fspacker.utils.matcher import compile_matcher
+
+NAMES = [
+    "torch/__init__.py",
+    "torch/utils/bottleneck/__main__.py",
+    "torch/utils/data/dataset/x.py",
+    "torch/utils/data/sampler.py",
+    "torch-2.0.dist-info/RECORD",
+    "PySide2/QtCore.pyd",
+    "PySide2/QtSql.pyd",
+    "PySide2/plugins/platforms/qwindows.dll",
+    "PySide2/plugins/platforms/readme.txt",
+    "pylab.py",
+]
+
+
+def test_compile_matcher(fnmatch_selected):
+    rules = [
+        (set(), TorchSpecPacker.EXCLUDES["torch"] | {"*dist-info/*"}),
+        (PySide2Packer.PATTERNS["pyside2"], {"*dist-info/*"}),
+        (set(), set()),
+    ]
+    for patterns, excludes in rules:
+        matcher = compile_matcher(frozenset(patterns), frozenset(excludes))
+        assert [matcher(_) for _ in NAMES] == [fnmatch_selected(_, patterns, excludes) for _ in NAMES]
+
+    # compiled once, shared by specs with same rules
+    assert compile_matcher(frozenset(), frozenset({"a/*"})) is compile_matcher(frozenset(), frozenset({"a/*"}))
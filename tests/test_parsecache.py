@@ -0,0 +1,71 @@
+import os
+
+from fspacker.core.parsecache import ParseCache
+from fspacker.core.scanners import scan_source
+from fspacker.settings import settings
+
+
+def test_parse_cache_hit_and_miss(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    source = tmp_path / "main.py"
+    source.write_text("import os\nimport yaml\n")
+
+    cache = ParseCache()
+    assert cache.get(source) is None
+
+    record = scan_source(source)
+    cache.put(source, record)
+    assert cache.get(source) == record
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    source.write_text("import os\nimport yaml, toml\n")
+    assert cache.get(source) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_parse_cache_digest_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    source = tmp_path / "main.py"
+    source.write_text("import yaml\n")
+
+    cache = ParseCache()
+    cache.put(source, scan_source(source))
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(source) == scan_source(source)
+
+
+def test_parse_cache_per_engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    source = tmp_path / "main.py"
+    source.write_text("import yaml\n")
+
+    cache = ParseCache()
+    monkeypatch.setitem(settings.config, "parser.engine", "scan")
+    cache.put(source, scan_source(source, "scan"))
+    assert cache.get(source) is not None
+
+    monkeypatch.setitem(settings.config, "parser.engine", "ast")
+    assert cache.get(source) is None
+
+
+def test_parse_cache_persist_and_evict(tmp_path, monkeypatch):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path))
+    sources = []
+    for i in range(3):
+        source = tmp_path / f"module_{i}.py"
+        source.write_text(f"import lib_{i}\n")
+        sources.append(source)
+
+    cache = ParseCache()
+    for source in sources:
+        cache.put(source, scan_source(source))
+    cache.save()
+    assert cache.filepath.exists()
+
+    cache = ParseCache()
+    assert cache.get(sources[0]).imports == ("lib_0",)
+    assert cache.evict(max_entries=1) == 2
+    assert len(cache.entries) == 1
+    assert cache.get(sources[0]) is not None
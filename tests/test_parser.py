@@ -80,3 +80,126 @@ def test_math_torch(run_parser):
 
 def test_web_bottle(run_parser):
     run_parser("web_bottle", {"bottle"})
+
+
+def test_parallel_prescan(dir_examples, run_parser):
+    from fspacker.core.scanners import scan_source
+
+    root = dir_examples / "base_helloworld"
+    parsers.RECORDS.clear()
+    parsers.prescan(root, jobs=2)
+
+    assert root / "base_helloworld.py" in parsers.RECORDS
+    for filepath, record in parsers.RECORDS.items():
+        assert record == scan_source(filepath)
+
+    run_parser(
+        "base_helloworld",
+        {"defusedxml", "orderedset"},
+        {
+            "modules",
+            "module_c",
+            "module_d",
+            "core",
+            "mathtools",
+        },
+    )
+    parsers.RECORDS.clear()
+
+
+def test_import_cycle(tmp_path, mocker, monkeypatch):
+    from fspacker.core import parsers as parsers_module
+    from fspacker.core.parsecache import ParseCache
+
+    # empty parse cache, every module is scanned
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setattr(parsers_module, "parse_cache", ParseCache())
+
+    (tmp_path / "cycle_app.py").write_text("import module_a\n\n\ndef main():\n    pass\n")
+    (tmp_path / "module_a.py").write_text("import module_b\nimport yaml\n")
+    (tmp_path / "module_b.py").write_text("import module_a\nimport module_b\n")
+
+    scan = mocker.spy(parsers_module, "scan_source")
+    parsers.parse(tmp_path / "cycle_app.py", tmp_path)
+
+    target = parsers.TARGETS["cycle_app"]
+    assert target.libs == {"yaml"}
+    assert target.sources == {"module_a", "module_b"}
+    assert len(target.graph) == 3
+    assert target.graph.successors(tmp_path / "module_a.py") == {tmp_path / "module_b.py"}
+    assert target.graph.cycles() == [[tmp_path / "module_a.py", tmp_path / "module_b.py"]]
+    # once per module of the cycle
+    assert scan.call_count == 3
+
+
+def test_folder_parser_index(tmp_path):
+    (tmp_path / "index_app.py").write_text('import helpers.tools\n\n\ndef main():\n    print("io and helpers")\n')
+    (tmp_path / "helpers").mkdir()
+    (tmp_path / "helpers" / "tools.py").write_text("")
+    (tmp_path / "io").mkdir()
+
+    parsers.parse(tmp_path / "index_app.py", tmp_path)
+    target = parsers.TARGETS["index_app"]
+    assert {"helpers", "helpers.tools"} <= target.imports
+
+    target.sources.clear()
+    parsers.parse(tmp_path / "io", tmp_path)
+    parsers.parse(tmp_path / "helpers", tmp_path)
+    assert target.sources == {"helpers"}
+
+
+def test_processor_parse_memory(dir_examples, caplog):
+    import logging
+
+    from fspacker.process import Processor
+
+    with caplog.at_level(logging.DEBUG):
+        Processor(dir_examples / "base_helloworld").parse()
+
+    target = parsers.TARGETS["base_helloworld"]
+    assert len(target.digest) == 64
+    assert not hasattr(target, "__dict__")
+    assert "Analysis peak memory" in caplog.text
+
+
+def test_hidden_imports(tmp_path, monkeypatch):
+    from fspacker.settings import settings
+
+    (tmp_path / "plugin_app.py").write_text(
+        'import importlib\n\n\ndef main():\n    importlib.import_module("plugins.x")\n'
+    )
+    (tmp_path / "plugins").mkdir()
+    (tmp_path / "plugins" / "x.py").write_text("import yaml\n")
+    monkeypatch.setitem(settings.config, "parser.hidden_imports", ["toml"])
+
+    parsers.parse(tmp_path / "plugin_app.py", tmp_path)
+    target = parsers.TARGETS["plugin_app"]
+    assert target.libs == {"yaml", "toml"}
+    assert target.sources == {"plugins"}
+
+
+def test_broad_handler_packed(tmp_path):
+    (tmp_path / "broad_app.py").write_text(
+        "try:\n    import numpy\nexcept Exception:\n    numpy = None\n\n\ndef main():\n    pass\n"
+    )
+
+    parsers.parse(tmp_path / "broad_app.py", tmp_path)
+    assert parsers.TARGETS["broad_app"].libs == {"numpy"}
+
+
+def test_explicit_entries(tmp_path, monkeypatch):
+    from fspacker.settings import settings
+
+    (tmp_path / "tool.py").write_text("import yaml\n\nyaml.safe_load('')\n")
+    (tmp_path / "helper.py").write_text("def main_window():\n    pass\n")
+
+    parsers.parse(tmp_path / "tool.py", tmp_path)
+    parsers.parse(tmp_path / "helper.py", tmp_path)
+    assert "tool" not in parsers.TARGETS
+    assert "helper" not in parsers.TARGETS
+
+    monkeypatch.setitem(settings.config, "parser.entries", ["tool.py"])
+    parsers.parse(tmp_path / "tool.py", tmp_path)
+    parsers.parse(tmp_path / "helper.py", tmp_path)
+    assert parsers.TARGETS["tool"].libs == {"yaml"}
+    assert "helper" not in parsers.TARGETS
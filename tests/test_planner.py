@@ -0,0 +1,59 @@
+import pathlib
+
+from fspacker.core.planner import plan_targets
+from fspacker.core.target import Dependency
+from fspacker.core.target import PackTarget
+from fspacker.process import Processor
+
+
+def _create_target(src, libs=(), sources=(), extra=()):
+    depends = Dependency()
+    depends.libs = set(libs)
+    depends.sources = set(sources)
+    depends.extra = set(extra)
+    return PackTarget(src=pathlib.Path(src), depends=depends)
+
+
+def test_plan_targets():
+    targets = [
+        _create_target("/proj/b.py", libs=["numpy", "yaml"], sources=["utils", "models"]),
+        _create_target("/proj/a.py", libs=["numpy"], sources=["utils"], extra=["tkinter"]),
+        _create_target("/proj/tool/c.py", sources=["helpers"]),
+    ]
+
+    plans = plan_targets(targets)
+    assert [_.dist_dir for _ in plans] == [pathlib.Path("/proj/dist"), pathlib.Path("/proj/tool/dist")]
+
+    units = {_.name: _ for _ in plans[0].units}
+    assert plans[0].units[0].name == "base:proj"
+    assert sorted(units) == [
+        "base:proj",
+        "depends:proj/a",
+        "depends:proj/b",
+        "entry:proj/a",
+        "entry:proj/b",
+        "library:proj",
+        "runtime:proj",
+    ]
+    assert units["library:proj"].target.libs == {"numpy", "yaml"}
+    assert units["library:proj"].target.extra == {"tkinter"}
+    # each source copied once, by first target
+    assert units["depends:proj/a"].target.sources == {"utils"}
+    assert units["depends:proj/b"].target.sources == {"models"}
+    assert units["entry:proj/b"].target is targets[0]
+
+    # no libraries to pack
+    assert sorted(_.name for _ in plans[1].units) == ["base:tool", "depends:tool/c", "entry:tool/c", "runtime:tool"]
+
+
+def test_processor_pack_shared_units(tmp_path, mocker):
+    targets = [_create_target(tmp_path / f"{_}.py", libs=["numpy"]) for _ in "abcde"]
+    processor = Processor(tmp_path, jobs=4)
+    packs = {k: mocker.patch.object(v, "pack") for k, v in processor.packers.items()}
+
+    processor.pack(targets)
+    assert packs["base"].call_count == 1
+    assert packs["runtime"].call_count == 1
+    assert packs["library"].call_count == 1
+    assert packs["depends"].call_count == 5
+    assert packs["entry"].call_count == 5
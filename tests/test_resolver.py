@@ -0,0 +1,64 @@
+import pathlib
+
+from pkginfo import Distribution
+
+from fspacker.core.libraryinfo import LibraryInfo
+from fspacker.core.resolver import Resolver
+
+
+def _candidates(*specs):
+    candidates = {}
+    for name, version, requires in specs:
+        distribution = Distribution()
+        distribution.name, distribution.version, distribution.requires_dist = name, version, tuple(requires)
+        info = LibraryInfo(meta_data=distribution, filepath=pathlib.Path(f"{name}-{version}-py3-none-any.whl"))
+        candidates.setdefault(name, []).append(info)
+    return candidates
+
+
+def _versions(resolution):
+    return {k: v.meta_data.version for k, v in resolution.pins.items()}
+
+
+def test_resolver_backtracking():
+    resolver = Resolver(
+        _candidates(
+            ("app", "1.0", ["lib-a", "lib-b"]),
+            ("lib-a", "2.0", ["lib-c>=2"]),
+            ("lib-a", "1.0", ["lib-c<2"]),
+            ("lib-b", "1.0", ["lib-c<2", "pywin32; sys_platform != 'win32'"]),
+            ("lib-c", "2.1", []),
+            ("lib-c", "1.5", []),
+        )
+    )
+    resolution = resolver.resolve(["app"])
+    assert _versions(resolution) == {"app": "1.0", "lib-a": "1.0", "lib-b": "1.0", "lib-c": "1.5"}
+    assert resolution.unresolved == {}
+    assert resolver.backtracks == 3
+
+
+def test_resolver_unresolved_and_extras():
+    resolver = Resolver(
+        _candidates(
+            ("requests", "2.31.0", ["idna>=2.5", "urllib3<3,>=1.21.1", "PySocks>=1.5.6; extra == 'socks'"]),
+            ("urllib3", "1.26.0", []),
+            ("idna", "1.0", []),
+            ("pysocks", "1.7.1", []),
+        )
+    )
+    resolution = resolver.resolve(["requests", "requests[socks]", "missing-lib"])
+    assert _versions(resolution) == {"requests": "2.31.0", "urllib3": "1.26.0", "pysocks": "1.7.1"}
+    assert {k: str(v) for k, v in resolution.unresolved.items()} == {"idna": ">=2.5", "missing-lib": ""}
+
+
+def test_resolver_recursive_extras():
+    resolver = Resolver(
+        _candidates(
+            ("a", "1.0", ["c[y]; extra == 'x'", "b; extra == 'x'"]),
+            ("b", "1.0", []),
+            ("c", "1.0", ["a[x]; extra == 'y'"]),
+        )
+    )
+    resolution = resolver.resolve(["a", "a[x]"])
+    assert _versions(resolution) == {"a": "1.0", "b": "1.0", "c": "1.0"}
+    assert resolution.extras == {"a": frozenset({"x"}), "b": frozenset(), "c": frozenset({"y"})}
@@ -0,0 +1,173 @@
+import pytest
+
+from fspacker.core.scanners import scan_content
+from fspacker.core.scanners import scan_source
+from fspacker.core.scanners import SCANNERS
+
+
+def test_scanners_match(dir_examples):
+    for filepath in dir_examples.rglob("*.py"):
+        content = filepath.read_text(encoding="utf-8")
+        record = SCANNERS["scan"].scan(content, filepath)
+
+        assert record is not None
+        assert record == SCANNERS["ast"].scan(content, filepath)
+
+
+@pytest.mark.parametrize(
+    "content, imports",
+    [
+        ("import os, sys as system\n", ("os", "sys")),
+        ("from . import module_a\nfrom .core.module_e import function_e\n", ("core.module_e",)),
+        ("from PySide2.QtWidgets import (\n    QApplication,\n    QWidget,\n)\n", ("PySide2.QtWidgets",)),
+        ('"""\nimport not_imported\n"""\ntext = "import neither"  # import nor\n', ()),
+    ],
+)
+def test_statement_scanner(tmp_path, content, imports):
+    record = SCANNERS["scan"].scan(content, tmp_path / "main.py")
+    assert record is not None
+    assert record.imports == imports
+
+
+@pytest.mark.parametrize(
+    "content, imports",
+    [
+        ("try: import yaml\nexcept ImportError: yaml = None\n", ("yaml",)),
+        ("import os, \\\n    sys\n", ("os", "sys")),
+        ("import os; import sys\n", ("os", "sys")),
+        ("def main():\n    import yaml\n", ("yaml",)),
+    ],
+)
+def test_statement_scanner_fallback(tmp_path, content, imports):
+    filepath = tmp_path / "main.py"
+    filepath.write_text(content)
+
+    assert SCANNERS["scan"].scan(content, filepath) is None
+    assert scan_source(filepath, engine="scan").imports == imports
+
+
+def test_import_kinds(tmp_path):
+    content = """\
+import os
+from typing import TYPE_CHECKING
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+else:
+    import orjson
+
+if TYPE_CHECKING:
+    import numpy
+else:
+    import toml
+
+if sys.platform == "win32":
+    import winreg
+
+
+def main():
+    try:
+        from yaml import CLoader
+    except (ValueError, ModuleNotFoundError):
+        if typing.TYPE_CHECKING:
+            import pandas
+"""
+    record = SCANNERS["ast"].scan(content, tmp_path / "main.py")
+    assert dict(zip(record.imports, record.kinds)) == {
+        "os": "hard",
+        "typing": "hard",
+        "ujson": "optional",
+        "json": "hard",
+        "orjson": "optional",
+        "numpy": "type-only",
+        "toml": "hard",
+        "winreg": "platform",
+        "yaml": "optional",
+        "pandas": "type-only",
+    }
+    assert SCANNERS["scan"].scan(content, tmp_path / "main.py") is None
+
+
+def test_broad_handlers_are_hard(tmp_path):
+    content = """\
+try:
+    import numpy
+except Exception:
+    numpy = None
+
+try:
+    import pandas
+except:
+    pandas = None
+
+try:
+    import scipy
+except (OSError, BaseException):
+    scipy = None
+
+try:
+    import yaml
+except (ValueError, ImportError):
+    yaml = None
+"""
+    record = SCANNERS["ast"].scan(content, tmp_path / "main.py")
+    assert dict(zip(record.imports, record.kinds)) == {
+        "numpy": "hard",
+        "pandas": "hard",
+        "scipy": "hard",
+        "yaml": "optional",
+    }
+
+
+def test_dynamic_imports(tmp_path):
+    content = """\
+import importlib
+from importlib import import_module
+
+PLUGINS = "app.plugins"
+BACKEND: str = "qt"
+
+importlib.import_module("pkg.plugins.x")
+import_module(PLUGINS + ".y")
+__import__(f"{PLUGINS}.{BACKEND}")
+importlib.import_module(".z", PLUGINS)
+importlib.import_module(name)
+__import__(f"{PLUGINS!r}")
+"""
+    record = SCANNERS["ast"].scan(content, tmp_path / "main.py")
+    assert record.imports == (
+        "importlib",
+        "importlib",
+        "pkg.plugins.x",
+        "app.plugins.y",
+        "app.plugins.qt",
+        "app.plugins.z",
+    )
+    assert SCANNERS["scan"].scan(content, tmp_path / "main.py") is None
+    assert record.kinds == ("hard",) * 6
+
+
+@pytest.mark.parametrize(
+    "content, is_entry",
+    [
+        ("def main():\n    pass\n", True),
+        ("async def main():\n    pass\n", True),
+        ("if __name__ == '__main__':\n    run()\n", True),
+        ('if "__main__" == __name__:\n    run()\n', True),
+        ('if (__name__ == "__main__"):\n    run()\n', True),
+        ("def main_window():\n    pass\n", False),
+        ("class App:\n    def main(self):\n        pass\n", False),
+        ('"""Run as: if __name__ == "__main__": main()"""\n# def main\n', False),
+        ('MAIN = "__main__"\n', False),
+    ],
+)
+def test_entry_detection(content, is_entry, tmp_path):
+    assert SCANNERS["ast"].scan(content, tmp_path / "app.py").is_entry is is_entry
+    assert scan_content(content, tmp_path / "app.py", engine="scan").is_entry is is_entry
+
+
+def test_entry_guard_fallback(tmp_path):
+    # guards the statement scan does not match are left to ast scanner
+    assert SCANNERS["scan"].scan('if (__name__ == "__main__"):\n    run()\n', tmp_path / "app.py") is None
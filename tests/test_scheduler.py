@@ -0,0 +1,60 @@
+import pathlib
+import threading
+import time
+
+import pytest
+
+from fspacker.core.scheduler import Stage
+from fspacker.core.scheduler import StageScheduler
+
+
+def test_stage_scheduler():
+    dist = pathlib.Path("/proj/dist")
+    order = []
+    lock = threading.Lock()
+
+    def work(name, seconds=0.0):
+        def run():
+            time.sleep(seconds)
+            with lock:
+                order.append(name)
+
+        return run
+
+    scheduler = StageScheduler(workers=4)
+    scheduler.add(Stage("base", work("base"), outputs={dist}))
+    scheduler.add(
+        Stage("runtime", work("runtime", 0.2), inputs={pathlib.Path("/cache/embed.zip")}, outputs={dist / "runtime"})
+    )
+    scheduler.add(Stage("depends", work("depends", 0.05), outputs={dist / "src" / "a.py"}))
+    scheduler.add(Stage("library", work("library", 0.05), outputs={dist / "site-packages"}))
+    scheduler.add(Stage("spec", work("spec"), inputs={dist / "site-packages" / "numpy"}))
+
+    depends = scheduler.dependencies()
+    assert depends["base"] == set()
+    assert depends["runtime"] == depends["depends"] == depends["library"] == {"base"}
+    assert depends["spec"] == {"base", "library"}
+
+    scheduler.run()
+    assert order[0] == "base"
+    assert order[-1] == "runtime"
+    assert order.index("spec") > order.index("library")
+
+    path, total = scheduler.critical_path()
+    assert path == ["base", "runtime"]
+    assert total >= 0.2
+
+    with pytest.raises(ValueError):
+        scheduler.add(Stage("base", work("base")))
+
+
+def test_stage_scheduler_failure():
+    def fail():
+        raise RuntimeError("stage failed")
+
+    scheduler = StageScheduler(workers=2)
+    scheduler.add(Stage("fail", fail, outputs={pathlib.Path("/a")}))
+    scheduler.add(Stage("after", lambda: None, inputs={pathlib.Path("/a/b")}))
+    with pytest.raises(RuntimeError):
+        scheduler.run()
+    assert "after" not in scheduler.times
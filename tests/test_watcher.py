@@ -0,0 +1,103 @@
+import pytest
+
+from fspacker.core.parsers import parsers
+from fspacker.core.watcher import InotifyWatcher
+from fspacker.core.watcher import PollingWatcher
+
+
+@pytest.fixture
+def watch_project(tmp_path):
+    (tmp_path / "watch_app.py").write_text("import module_a\n\n\ndef main():\n    pass\n")
+    (tmp_path / "module_a.py").write_text("import yaml\n")
+    (tmp_path / "dist").mkdir()
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "watcher_class",
+    [
+        PollingWatcher,
+        pytest.param(
+            InotifyWatcher,
+            marks=pytest.mark.skipif(not InotifyWatcher.is_available(), reason="inotify not available"),
+        ),
+    ],
+)
+def test_watcher_changes(watch_project, watcher_class):
+    watcher = watcher_class(watch_project)
+    (watch_project / "module_a.py").write_text("import yaml\nimport toml\n")
+    (watch_project / "dist" / "ignored.py").write_text("")
+
+    assert watcher.wait(0.1) == {watch_project / "module_a.py"}
+    watcher.close()
+
+
+def test_processor_update(watch_project, mocker):
+    from fspacker.process import Processor
+
+    processor = Processor(watch_project)
+    packers = {k: mocker.MagicMock() for k in processor.packers}
+    processor.packers = packers
+
+    parsers.parse(watch_project / "watch_app.py", watch_project)
+    processor.parsed["watch_app"] = parsers.TARGETS["watch_app"].depends.copy()
+
+    module_a = watch_project / "module_a.py"
+    module_a.write_text("import yaml\nimport toml\n")
+    processor.update({module_a})
+
+    packers["depends"].update.assert_called_once()
+    packers["entry"].pack.assert_called_once()
+    partial = packers["library"].pack.call_args[0][0]
+    assert partial.libs == {"toml"}
+    packers["runtime"].pack.assert_not_called()
+    packers["base"].pack.assert_not_called()
+
+    processor.update({watch_project / "README.md"})
+    assert packers["depends"].update.call_count == 1
+
+
+def test_processor_update_syntax_error(watch_project, mocker):
+    from fspacker.process import Processor
+
+    processor = Processor(watch_project)
+    packers = {k: mocker.MagicMock() for k in processor.packers}
+    processor.packers = packers
+
+    parsers.parse(watch_project / "watch_app.py", watch_project)
+    processor.parsed["watch_app"] = parsers.TARGETS["watch_app"].depends.copy()
+
+    module_a = watch_project / "module_a.py"
+    module_a.write_text("import yaml\nimport (\n")
+    processor.update({module_a})
+    packers["depends"].update.assert_not_called()
+
+    # still watching, fixed file is picked up
+    module_a.write_text("import yaml\nimport toml\n")
+    processor.update({module_a})
+    packers["depends"].update.assert_called_once()
+
+
+def test_processor_update_removed_entry(watch_project, mocker):
+    from fspacker.process import Processor
+
+    processor = Processor(watch_project)
+    entry_packer = processor.packers["entry"]
+    packers = {k: mocker.MagicMock() for k in processor.packers}
+    packers["entry"] = mocker.MagicMock(wraps=entry_packer)
+    processor.packers = packers
+
+    parsers.parse(watch_project / "watch_app.py", watch_project)
+    target = parsers.TARGETS["watch_app"]
+    processor.parsed["watch_app"] = target.depends.copy()
+    artifacts = [*entry_packer.outputs(target), target.dist_dir / "src" / "watch_app.py"]
+    for path in artifacts:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+    entry = watch_project / "watch_app.py"
+    entry.unlink()
+    processor.update({entry})
+    packers["entry"].pack.assert_not_called()
+    assert "watch_app" not in parsers.TARGETS and "watch_app" not in processor.parsed
+    assert not any(_.exists() for _ in artifacts)
@@ -0,0 +1,38 @@
+import pathlib
+import subprocess
+
+from fspacker.settings import settings
+from fspacker.utils import wheel
+
+
+def test_download_wheel_target_tags(mocker, monkeypatch):
+    lib_file = pathlib.Path("numpy-2.0.0-cp38-cp38-win_arm64.whl")
+    mocker.patch.object(wheel, "_find_local_wheel", side_effect=[None, lib_file])
+    mocker.patch.object(wheel, "get_fastest_pip_url", return_value="https://pypi.org/simple/")
+    mocker.patch.object(wheel.cache_manager, "touch")
+    check_call = mocker.patch("subprocess.check_call")
+    monkeypatch.setitem(settings.config, "target.platform", "win_arm64")
+
+    assert wheel.download_wheel("numpy", ">=2.0") == lib_file
+
+    args = check_call.call_args[0][0]
+    assert args[:5] == ["python", "-m", "pip", "download", "numpy>=2.0"]
+    assert args[args.index("--platform") + 1] == "win_arm64"
+    assert args[args.index("--python-version") + 1] == settings.python_ver_short
+    assert args[args.index("--implementation") + 1] == "cp"
+    assert "--only-binary=:all:" in args
+
+
+def test_download_wheel_sdist_fallback(mocker):
+    sdist = pathlib.Path("docopt-0.6.2.tar.gz")
+    mocker.patch.object(wheel, "_find_local_wheel", side_effect=[None, sdist])
+    mocker.patch.object(wheel, "get_fastest_pip_url", return_value="https://pypi.org/simple/")
+    mocker.patch.object(wheel.cache_manager, "touch")
+    check_call = mocker.patch("subprocess.check_call", side_effect=[subprocess.CalledProcessError(1, "pip"), 0])
+
+    assert wheel.download_wheel("docopt") == sdist
+
+    binary, source = (_[0][0] for _ in check_call.call_args_list)
+    assert "--only-binary=:all:" in binary
+    assert source[:5] == ["python", "-m", "pip", "download", "docopt"]
+    assert "--platform" not in source and "--no-binary=:all:" in source and "--no-deps" in source
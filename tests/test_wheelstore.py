@@ -0,0 +1,68 @@
+import os
+
+from fspacker.core.wheelstore import WheelStore
+
+
+def test_wheel_store_install(tmp_path, monkeypatch, mocker, create_wheel):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path / "cache"))
+    wheel = create_wheel(
+        tmp_path / "foo-1.0-py3-none-any.whl",
+        members={
+            "foo/__init__.py": "",
+            "foo/core.py": "x = 1",
+            "foo/tests/test_core.py": "x = 1",
+            "foo-1.0.dist-info/METADATA": "Name: foo",
+            "../evil.py": "",
+        },
+    )
+
+    store = WheelStore()
+    spy = mocker.spy(store, "extract")
+    dest = tmp_path / "site-packages"
+    assert store.install(wheel, dest, lambda x: "/tests/" not in x and "dist-info" not in x) == 2
+    assert (dest / "foo" / "core.py").read_text() == "x = 1"
+    assert not (dest / "foo" / "tests").exists()
+    assert not (tmp_path / "evil.py").exists()
+    # identical content stored once
+    assert len(list(store.objects_dir.glob("*/*"))) == 3
+    assert os.path.samefile(dest / "foo" / "core.py", store.object_path(store.manifest(wheel)["foo/core.py"]))
+    # extracted once, later installs of same store reuse manifest
+    assert spy.call_count == 1
+
+    # warm install reads manifest from disk, nothing extracted
+    store = WheelStore()
+    spy = mocker.spy(store, "extract")
+    assert store.install(wheel, tmp_path / "dist2", lambda x: True) == 4
+    assert spy.call_count == 0
+
+    # links across filesystems fall back to copies
+    mocker.patch("os.link", side_effect=OSError("cross-device link"))
+    assert store.install(wheel, dest, lambda x: x == "foo/core.py") == 1
+    assert store.copies == 1
+    assert (dest / "foo" / "core.py").read_text() == "x = 1"
+
+    wheel.unlink()
+    assert store.collect() == (3, 14)
+    assert not list(store.manifests_dir.glob("*.json"))
+
+
+def test_wheel_store_parallel_extract(tmp_path, monkeypatch, create_wheel):
+    monkeypatch.setenv("FSPACKER_CACHE", str(tmp_path / "cache"))
+    members = {f"pkg/sub{i % 7}/mod{i}.py": os.urandom(i * 97) for i in range(64)}
+    wheel = create_wheel(tmp_path / "pkg-1.0-py3-none-any.whl", members=members)
+
+    store = WheelStore()
+    serial = store.extract(wheel)
+    assert store.extracted_files == 64
+
+    monkeypatch.setattr(WheelStore, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(WheelStore, "PREALLOCATE", True)
+    store = WheelStore()
+    assert store.extract(wheel) == serial
+    assert list(serial) == list(members)
+    assert store.extracted_bytes == sum(len(_) for _ in members.values())
+
+    dest = tmp_path / "site-packages"
+    assert store.install(wheel, dest, lambda x: True) == 64
+    assert all((dest / k).read_bytes() == v for k, v in members.items())
+    assert not list(store.objects_dir.glob("*.tmp"))